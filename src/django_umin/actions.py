@@ -3,9 +3,15 @@
 Bulk actions for django-umin CRUD views.
 Similar to Django Admin's actions system.
 """
+import csv
+import functools
+import io
+from itertools import islice
+
 from django.contrib import messages
-from django.http import HttpResponse
-from django.shortcuts import redirect
+from django.core.exceptions import FieldDoesNotExist
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import redirect, render
 from django.template.loader import render_to_string
 
 
@@ -36,26 +42,43 @@ class Action:
 
 
 class DeleteSelectedAction(Action):
-    """Default bulk delete action."""
+    """
+    Default bulk delete action.
+
+    Set ``fast_delete = True`` to delete the selection with a single SQL
+    DELETE through ``QuerySet._raw_delete()``. This skips Django's deletion
+    collector: no ``pre_delete``/``post_delete`` signals are sent and no
+    ``on_delete`` cascades run, so only use it for models whose related rows
+    are removed by the database itself (or that have none).
+    """
 
     short_description = "Delete selected items"
+    fast_delete = False
 
     def __call__(self, crud_view, request, queryset):
-        count = queryset.count()
         model_name = crud_view.model._meta.verbose_name_plural
 
         if request.method == "POST" and request.POST.get("confirm") == "yes":
-            # Actually delete the objects
-            queryset.delete()
+            if self.fast_delete:
+                count = queryset._raw_delete(queryset.db)
+            else:
+                # Actually delete the objects, counting only rows of this
+                # model (the total also includes cascaded deletes)
+                _, deleted = queryset.delete()
+                count = deleted.get(crud_view.model._meta.label, 0)
             messages.success(
                 request, f"Successfully deleted {count} {model_name}."
             )
             return None  # Return to list view
 
+        # Fetch the selection once; the template iterates it twice
+        objs = list(queryset)
+        count = len(objs)
+
         # Show confirmation page
         context = {
-            "action": "delete_selected",
-            "queryset": queryset,
+            "action": request.POST.get("action", "delete_selected"),
+            "queryset": objs,
             "count": count,
             "model_name": model_name,
             "crud_view": crud_view,
@@ -69,7 +92,6 @@ class DeleteSelectedAction(Action):
             return HttpResponse(html)
 
         # Return HttpResponse for non-HTMX requests too
-        from django.shortcuts import render
         return render(request, "django_umin/actions/confirm_delete_full.html", context)
 
 
@@ -82,45 +104,85 @@ def delete_selected(crud_view, request, queryset):
 delete_selected.short_description = "Delete selected items"
 
 
+@functools.lru_cache(maxsize=None)
+def _default_export_fields(model):
+    """Names of the editable, non-auto fields of model, computed once."""
+    return tuple(
+        f.name for f in model._meta.fields if not f.auto_created and f.editable
+    )
+
+
 class ExportCSVAction(Action):
     """Export selected items as CSV."""
 
     short_description = "Export selected as CSV"
+    chunk_size = 2000  # Rows fetched from the database and written per chunk
 
     def __call__(self, crud_view, request, queryset):
-        import csv
-        from django.http import HttpResponse
-
-        # Create the HttpResponse object with CSV header
-        response = HttpResponse(content_type="text/csv")
+        # Get fields to export (use list_display if available)
+        if crud_view.list_display:
+            fields = tuple(crud_view.list_display)
+        else:
+            fields = _default_export_fields(crud_view.model)
+
+        chunk_size = self.chunk_size
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush():
+            data = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            return data
+
+        def rows():
+            # Write header
+            writer.writerow(fields)
+            yield flush()
+
+            # Stream data rows from the database instead of caching every
+            # instance on the queryset
+            if self.is_column_export(crud_view.model, fields):
+                # Plain columns only: fetch tuples and skip model instantiation
+                values = queryset.values_list(*fields).iterator(
+                    chunk_size=chunk_size
+                )
+            else:
+                values = (
+                    [str(obj) if f == "__str__" else getattr(obj, f, "") for f in fields]
+                    for obj in queryset.iterator(chunk_size=chunk_size)
+                )
+
+            # Let writerows() loop over each chunk in C and send it as one piece
+            while True:
+                chunk = list(islice(values, chunk_size))
+                if not chunk:
+                    break
+                writer.writerows(chunk)
+                yield flush()
+
+        response = StreamingHttpResponse(rows(), content_type="text/csv")
         response["Content-Disposition"] = (
             f'attachment; filename="{crud_view.model._meta.model_name}_export.csv"'
         )
+        return response
 
-        # Get fields to export (use list_display if available)
-        fields = crud_view.list_display or [
-            f.name
-            for f in crud_view.model._meta.fields
-            if not f.auto_created and f.editable
-        ]
-
-        writer = csv.writer(response)
-
-        # Write header
-        writer.writerow(fields)
-
-        # Write data rows
-        for obj in queryset:
-            row = []
-            for field in fields:
-                if field == "__str__":
-                    value = str(obj)
-                else:
-                    value = getattr(obj, field, "")
-                row.append(value)
-            writer.writerow(row)
+    def is_column_export(self, model, fields):
+        """
+        Check whether every export field is a concrete, non-relational column.
 
-        return response
+        Such fields can be exported straight from values_list(); anything else
+        (``__str__``, properties, foreign keys rendered via ``str()``) needs
+        the model instance.
+        """
+        for name in fields:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return False
+            if not field.concrete or field.is_relation:
+                return False
+        return True
 
 
 def export_csv(crud_view, request, queryset):
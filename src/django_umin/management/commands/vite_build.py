@@ -1,21 +1,133 @@
+import functools
+import hashlib
+import json
 import os
+import shutil
 import subprocess
 import tempfile
-import glob
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from django.apps import apps
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 
+from django_umin.management.vite_utils import (
+    CSS_SUBDIR,
+    FE_SUBDIR,
+    JS_SUBDIR,
+    discover_fe_assets,
+    has_node_modules,
+    iter_files,
+    vite_command,
+    vite_env,
+)
+
+# Directory (relative to BASE_DIR) holding the generated Vite config files
+VITE_CONFIG_CACHE_DIR = ".vite-umin-cache"
+
+# Static Vite config shipped with the package. It reads the per-app params
+# written by this command from the file named in VITE_UMIN_PARAMS.
+VITE_CONFIG_SHIM = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "vite",
+    "vite-umin.config.js",
+)
+
+# Node script that runs every app's build in one process. %(config_file)s is
+# replaced with the config shim and %(apps)s with the [app_name, params_file]
+# pairs.
+BATCH_RUNNER_TEMPLATE = """
+import { build } from 'vite';
+
+const configFile = %(config_file)s;
+const apps = [
+%(apps)s
+];
+
+for (const [appName, paramsFile] of apps) {
+  process.env.VITE_UMIN_PARAMS = paramsFile;
+  try {
+    await build({ configFile });
+  } catch (e) {
+    console.error(`Failed to build assets for ${appName}.`);
+    console.error(e);
+    process.exitCode = 1;
+  }
+}
+"""
+
+
+def _write_content_addressed(directory, prefix, content, suffix=".js"):
+    """Write content to <directory>/<prefix>-<sha1><suffix> unless it exists."""
+    digest = hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+    path = os.path.join(directory, f"{prefix}-{digest}{suffix}")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_file = tempfile.mkstemp(suffix=suffix, dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.replace(temp_file, path)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def _has_fe_dir(app_path):
+    """Check (once per process) whether an app has an 'fe' directory."""
+    return os.path.isdir(os.path.join(app_path, FE_SUBDIR))
+
 
 class Command(BaseCommand):
     help = "Discovers and builds Vite assets for all registered Django apps."
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Serialises output from builds running in parallel
+        self._output_lock = threading.Lock()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clean",
+            action="store_true",
+            default=False,
+            help=f"Remove cached Vite config files in '{VITE_CONFIG_CACHE_DIR}' before building.",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=None,
+            help="Number of app builds to run in parallel. Defaults to the number of CPUs.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            default=False,
+            help="Rebuild every app, even when its manifest is newer than its sources.",
+        )
+        parser.add_argument(
+            "--batch",
+            action="store_true",
+            default=False,
+            help="Build all apps from a single Node process instead of one per app.",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("Starting Vite build process...")
 
         project_root = str(settings.BASE_DIR)
-        node_modules_path = os.path.join(project_root, "node_modules")
-        if not os.path.isdir(node_modules_path):
+        cache_dir = os.path.join(project_root, VITE_CONFIG_CACHE_DIR)
+        if options.get("clean") and os.path.isdir(cache_dir):
+            shutil.rmtree(cache_dir)
+            self.stdout.write(f"Removed cached Vite configs in {cache_dir}")
+
+        config_file = None
+
+        if not has_node_modules(project_root):
             self.stderr.write(
                 self.style.ERROR(
                     "node_modules directory not found. Please run 'npm install'."
@@ -25,20 +137,21 @@ class Command(BaseCommand):
 
         installed_apps = [app.name for app in apps.get_app_configs()]
 
-
+        builds = []
         for app_name in installed_apps:
+            app_name_simple = app_name.rpartition(".")[2]
             try:
-                app_config = apps.get_app_config(app_name.split(".")[-1])
+                app_config = apps.get_app_config(app_name_simple)
             except LookupError:
                 self.stderr.write(f"Could not find app config for {app_name}")
                 continue
 
             app_path = app_config.path
-            fe_dir = os.path.join(app_path, "fe")
-
-            if not os.path.exists(fe_dir):
+            if not _has_fe_dir(app_path):
                 continue
 
+            fe_dir = os.path.join(app_path, FE_SUBDIR)
+
             # Discover assets dynamically
             assets = self.discover_assets(fe_dir)
             if not assets:
@@ -46,119 +159,238 @@ class Command(BaseCommand):
 
             self.stdout.write(f"Found Vite-enabled app: {app_name}")
 
-            app_name_simple = app_name.split(".")[-1]
-
-            vite_config_content = self.generate_vite_config(
+            vite_params = self.generate_vite_config(
                 project_root, app_path, app_name_simple, assets
             )
 
-            temp_config_file = None
             try:
-                with tempfile.NamedTemporaryFile(
-                    mode="w", delete=False, suffix=".js", dir=project_root
-                ) as f:
-                    f.write(vite_config_content)
-                    temp_config_file = f.name
-
-                self.stdout.write(
-                    f"Building {app_name} using config {temp_config_file}..."
+                if config_file is None:
+                    config_file = self.write_config_shim(cache_dir)
+                params_file = self.write_vite_config(
+                    cache_dir, app_name_simple, vite_params
                 )
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f"An error occurred: {e}"))
+                continue
 
-                command = ["npx", "vite", "build", "--config", temp_config_file]
-
-                result = subprocess.run(
-                    command,
-                    cwd=project_root,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
+            out_dir = os.path.join(app_path, "static", app_name_simple, "dist")
+            if not options.get("force") and self.is_up_to_date(
+                fe_dir, out_dir, params_file, config_file
+            ):
+                self.stdout.write(f"Assets for {app_name} are up-to-date, skipping.")
+                continue
 
-                self.stdout.write(result.stdout)
-                if result.stderr:
-                    self.stderr.write(result.stderr)
+            self.stdout.write(f"Building {app_name} using params {params_file}...")
+            builds.append((app_name, params_file))
 
-            except subprocess.CalledProcessError as e:
-                self.stderr.write(
-                    self.style.ERROR(f"Failed to build assets for {app_name}.")
-                )
-                self.stderr.write(e.stdout)
-                self.stderr.write(e.stderr)
-            except Exception as e:
-                self.stderr.write(self.style.ERROR(f"An error occurred: {e}"))
-            finally:
-                if temp_config_file and os.path.exists(temp_config_file):
-                    os.remove(temp_config_file)
-                    self.stdout.write(
-                        f"Cleaned up temporary config file {temp_config_file}"
-                    )
+        if builds and options.get("batch"):
+            self.run_batched_build(project_root, cache_dir, config_file, builds)
+        elif builds:
+            self.run_parallel_builds(
+                project_root, config_file, builds, options.get("jobs")
+            )
 
         self.stdout.write(self.style.SUCCESS("Vite assets build process completed."))
 
+    def run_parallel_builds(self, project_root, config_file, builds, jobs=None):
+        """
+        Run one `vite build` process per app, several at a time.
+
+        Raises CommandError once every build has finished if any of them
+        failed.
+        """
+        # Vite builds are independent per app, so run them side by side; the
+        # worker threads only wait on the child processes.
+        max_workers = min(jobs or os.cpu_count() or 1, len(builds))
+        failed = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.run_streaming,
+                    vite_command(project_root, "build", "--config", config_file),
+                    project_root,
+                    prefix=f"[{app_name}] ",
+                    env=vite_env(params_file),
+                ): app_name
+                for app_name, params_file in builds
+            }
+
+            for future in as_completed(futures):
+                app_name = futures[future]
+                try:
+                    if future.result():
+                        failed.append(app_name)
+                        self.stderr.write(
+                            self.style.ERROR(f"Failed to build assets for {app_name}.")
+                        )
+                except Exception as e:
+                    failed.append(app_name)
+                    self.stderr.write(self.style.ERROR(f"An error occurred: {e}"))
+
+        if failed:
+            raise CommandError(
+                f"Failed to build assets for: {', '.join(sorted(failed))}"
+            )
+
+    def run_batched_build(self, project_root, cache_dir, config_file, builds):
+        """
+        Build every app from a single Node process using Vite's build() API.
+
+        Each app keeps its own params (and therefore its own outDir and
+        manifest), but Node and Vite only start once. Raises CommandError if
+        any app failed to build.
+        """
+        app_params = ",\n".join(
+            f"  [{json.dumps(app_name)}, {json.dumps(params_file)}]"
+            for app_name, params_file in builds
+        )
+        runner_content = BATCH_RUNNER_TEMPLATE % {
+            "config_file": json.dumps(config_file),
+            "apps": app_params,
+        }
+        runner = _write_content_addressed(cache_dir, "batch", runner_content, ".mjs")
+
+        try:
+            returncode = self.run_streaming(["node", runner], project_root)
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f"An error occurred: {e}"))
+            return
+
+        if returncode:
+            raise CommandError("Failed to build assets for one or more apps.")
+
+    def run_streaming(self, command, project_root, prefix="", env=None):
+        """
+        Run command, echoing its output line by line as it is produced.
+
+        stderr is drained from a helper thread so neither pipe can fill up and
+        block the child. Returns the process exit code.
+        """
+        process = subprocess.Popen(
+            command,
+            cwd=project_root,
+            env=env or vite_env(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+
+        def drain(pipe, out):
+            for line in pipe:
+                with self._output_lock:
+                    out.write(f"{prefix}{line}")
+
+        stderr_thread = threading.Thread(
+            target=drain, args=(process.stderr, self.stderr), daemon=True
+        )
+        stderr_thread.start()
+        drain(process.stdout, self.stdout)
+        stderr_thread.join()
+        return process.wait()
+
+    def is_up_to_date(self, fe_dir, out_dir, params_file, config_file):
+        """
+        Check whether the app's manifest is newer than its sources and config.
+
+        The mtimes of the directories below fe_dir count as well, since
+        deleting or renaming a source only changes its directory. The params
+        file is content-addressed and may be an older one reused, so those
+        directory mtimes also catch an asset set reverted to a previous one.
+        """
+        manifest_path = os.path.join(out_dir, "manifest.json")
+        try:
+            manifest_mtime = os.stat(manifest_path).st_mtime_ns
+        except OSError:
+            return False
+
+        dir_mtimes = {}
+        src_mtime = max(
+            os.stat(path).st_mtime_ns
+            for path in (params_file, config_file, VITE_CONFIG_SHIM)
+        )
+        for entry in iter_files(fe_dir, "", visited=dir_mtimes):
+            src_mtime = max(src_mtime, entry.stat().st_mtime_ns)
+        src_mtime = max(src_mtime, *dir_mtimes.values())
+        return manifest_mtime >= src_mtime
+
+    def write_config_shim(self, cache_dir):
+        """
+        Copy the static Vite config into cache_dir and return its path.
+
+        Vite resolves the config's imports relative to the config file, so it
+        has to live inside the project rather than in site-packages.
+        """
+        with open(VITE_CONFIG_SHIM) as f:
+            return _write_content_addressed(cache_dir, "vite-umin.config", f.read())
+
+    def write_vite_config(self, cache_dir, app_name, content):
+        """
+        Write an app's Vite params to a content-addressed file in cache_dir.
+
+        The file is only written when no params with the same content exist,
+        so unchanged apps reuse the previous file instead of creating and
+        deleting a temporary one on every build.
+        """
+        return _write_content_addressed(
+            cache_dir, f"vite-umin.params-{app_name}", content, ".json"
+        )
+
     def discover_assets(self, fe_dir):
         """Discover CSS and JS assets in the frontend directory."""
+        css_files, js_files = discover_fe_assets(fe_dir)
         assets = {}
 
         # Discover CSS files
-        css_dir = os.path.join(fe_dir, "css")
-        if os.path.exists(css_dir):
-            css_files = glob.glob(os.path.join(css_dir, "*.css"))
-            for css_file in css_files:
-                filename = os.path.basename(css_file)
-                name_without_ext = os.path.splitext(filename)[0]
-                assets[f"{name_without_ext}-css"] = os.path.join("css", filename)
+        for filename in css_files:
+            name_without_ext = os.path.splitext(filename)[0]
+            assets[f"{name_without_ext}-css"] = os.path.join(CSS_SUBDIR, filename)
 
         # Discover JS files (including subdirectories)
-        js_dir = os.path.join(fe_dir, "js")
-        if os.path.exists(js_dir):
-            js_files = glob.glob(os.path.join(js_dir, "**", "*.js"), recursive=True)
-            for js_file in js_files:
-                rel_path = os.path.relpath(js_file, js_dir)
-                filename = os.path.basename(js_file)
-                name_without_ext = os.path.splitext(filename)[0]
-                # Use relative path for asset name to avoid conflicts
-                path_without_ext = os.path.splitext(rel_path)[0].replace("/", "-")
-                assets[f"{path_without_ext}-js"] = os.path.join("js", rel_path)
+        for rel_path in js_files:
+            # Use relative path for asset name to avoid conflicts
+            path_without_ext = os.path.splitext(rel_path)[0].replace("/", "-")
+            assets[f"{path_without_ext}-js"] = os.path.join(JS_SUBDIR, rel_path)
 
         return assets
 
     def generate_vite_config(self, project_root, app_path, app_name, assets):
-        source_dir = os.path.join(app_path, "fe")
-        out_dir = os.path.join(app_path, "static", app_name, "dist")
-
-        # We need paths to be relative to the project root for vite
-        rel_source_dir = os.path.relpath(source_dir, project_root)
-        rel_out_dir = os.path.relpath(out_dir, project_root)
-
-        # Generate input entries dynamically
-        input_entries = []
-        for asset_name, asset_path in assets.items():
-            input_entries.append(
-                f"        '{asset_name}': join('{rel_source_dir}', '{asset_path}')"
-            )
+        """Generate the JSON params for the Vite config of a single app."""
+        return _render_vite_config(
+            project_root, app_path, app_name, tuple(sorted(assets.items()))
+        )
 
-        input_config = ",\n".join(input_entries)
-
-        return f"""
-import {{ defineConfig }} from 'vite';
-import {{ resolve, join }} from 'path';
-import tailwindcss from '@tailwindcss/vite';
-
-export default defineConfig({{
-  base: '/static/',
-  root: resolve('.'),
-  plugins: [
-    tailwindcss(),
-  ],
-  build: {{
-    manifest: 'manifest.json',
-    outDir: resolve('{rel_out_dir}'),
-    rollupOptions: {{
-      input: {{
-{input_config}
-      }},
-    }},
-    emptyOutDir: true,
-  }},
-}});
-"""
+
+@functools.lru_cache(maxsize=None)
+def _render_vite_config(project_root, app_path, app_name, assets):
+    """Render the params read by VITE_CONFIG_SHIM; assets is a sorted tuple."""
+    source_dir = os.path.join(app_path, FE_SUBDIR)
+    out_dir = os.path.join(app_path, "static", app_name, "dist")
+
+    # We need paths to be relative to the project root for vite
+    rel_source_dir = os.path.relpath(source_dir, project_root)
+    rel_out_dir = os.path.relpath(out_dir, project_root)
+
+    params = {
+        "base": "/static/",
+        "root": ".",
+        "outDir": rel_out_dir,
+        "inputs": {
+            asset_name: os.path.join(rel_source_dir, asset_path)
+            for asset_name, asset_path in assets
+        },
+    }
+    return json.dumps(params, indent=2)
+
+
+def build_all(stdout=None, stderr=None, **options):
+    """
+    Build Vite assets for all apps without going through the command line.
+
+    Accepts the same options as the command (clean, jobs, force, batch), so
+    other Python code can run a build in the current process:
+
+        from django_umin.management.commands.vite_build import build_all
+        build_all(sys.stdout, sys.stderr, force=True)
+    """
+    return Command(stdout=stdout, stderr=stderr).handle(**options)
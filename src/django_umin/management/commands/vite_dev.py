@@ -1,17 +1,38 @@
 import os
 import subprocess
 import tempfile
-import glob
+from pathlib import PurePath
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 
 
 from django.apps import apps
 
+from django_umin.management.vite_utils import (
+    CSS_SUBDIR,
+    FE_SUBDIR,
+    JS_SUBDIR,
+    discover_fe_assets,
+    has_node_modules,
+    vite_command,
+    vite_env,
+)
+
 
 class Command(BaseCommand):
     help = "Runs a Vite dev server that watches all apps with frontend assets."
 
+    # 'fe' directory per app, shared across invocations (e.g. autoreload):
+    # {app_name: (app_path_mtime, fe_dir or None)}
+    _fe_cache = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Process and file helpers, replaceable per instance (e.g. in tests)
+        self._runner = subprocess.run
+        self._mkstemp = tempfile.mkstemp
+        self._remove = os.remove
+
     def add_arguments(self, parser):
         parser.add_argument(
             "--app",
@@ -26,13 +47,19 @@ class Command(BaseCommand):
             default=False,
             help="Keep the temporary Vite config file after the server stops. Default is to delete it.",
         )
+        parser.add_argument(
+            "--exec",
+            action="store_true",
+            dest="exec_vite",
+            default=False,
+            help="Replace this process with the Vite dev server instead of running it as a child. The config file is kept.",
+        )
 
     def handle(self, *args, **options):
         project_root = str(settings.BASE_DIR)
         keep_config = options.get("keep_vite_config", False)
 
-        node_modules_path = os.path.join(project_root, "node_modules")
-        if not os.path.isdir(node_modules_path):
+        if not has_node_modules(project_root):
             self.stderr.write(
                 self.style.ERROR(
                     "node_modules directory not found. Please run 'npm install'."
@@ -41,9 +68,9 @@ class Command(BaseCommand):
             return
 
         # Discover apps with 'fe' directories
-        app_configs = self.discover_vite_apps(options.get("app_names"))
+        vite_apps = self.discover_vite_apps(options.get("app_names"))
 
-        if not app_configs:
+        if not vite_apps:
             self.stderr.write(
                 self.style.ERROR(
                     "No apps with 'fe' directories found. "
@@ -54,31 +81,39 @@ class Command(BaseCommand):
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"Starting Vite dev server for {len(app_configs)} app(s): "
-                f"{', '.join([ac.name for ac in app_configs])}"
+                f"Starting Vite dev server for {len(vite_apps)} app(s): "
+                f"{', '.join([ac.name for ac, _ in vite_apps])}"
             )
         )
 
-        vite_config_content = self.generate_vite_config(project_root, app_configs)
+        vite_config_content = self.generate_vite_config(project_root, vite_apps)
 
         temp_config_file = None
         try:
-            with tempfile.NamedTemporaryFile(
-                mode="w", delete=False, suffix=".js", dir=project_root
-            ) as f:
-                f.write(vite_config_content)
-                temp_config_file = f.name
+            # Write the encoded config with one os.write(), skipping the
+            # buffered text IO layer
+            fd, temp_config_file = self._mkstemp(suffix=".js", dir=project_root)
+            try:
+                os.write(fd, vite_config_content.encode("utf-8"))
+            finally:
+                os.close(fd)
 
             self.stdout.write(f"Using temporary config: {temp_config_file}")
 
-            command = ["npx", "vite", "--config", temp_config_file, "--host", "0.0.0.0"]
+            command = vite_command(
+                project_root, "--config", temp_config_file, "--host", "0.0.0.0"
+            )
 
             # Set environment variables
-            env = os.environ.copy()
+            env = vite_env()
             env["VITE_CJS_IGNORE_WARNING"] = "true"
 
+            if options.get("exec_vite"):
+                # Only returns if the executable could not be found
+                self.exec_vite(command, project_root, env, temp_config_file)
+
             # This will run indefinitely until the user stops it with Ctrl+C
-            subprocess.run(command, cwd=project_root, check=True, env=env)
+            self._runner(command, cwd=project_root, check=True, env=env)
 
         except subprocess.CalledProcessError:
             self.stderr.write(self.style.ERROR("Vite dev server stopped unexpectedly."))
@@ -97,23 +132,50 @@ class Command(BaseCommand):
                         )
                     )
                 else:
-                    os.remove(temp_config_file)
+                    self._remove(temp_config_file)
                     self.stdout.write(
                         f"Cleaned up temporary config file {temp_config_file}"
                     )
 
+    def exec_vite(self, command, project_root, env, config_file):
+        """
+        Replace the current process with Vite, saving the parent process.
+
+        Nothing runs after a successful exec, so the config file cannot be
+        cleaned up and is kept. Returns only if the executable is not found.
+        """
+        self.stdout.write(f"Vite config will be kept at: {config_file}")
+        self.stdout.flush()
+        self.stderr.flush()
+
+        cwd = os.getcwd()
+        os.chdir(project_root)
+        try:
+            os.execvpe(command[0], command, env)
+        except FileNotFoundError:
+            os.chdir(cwd)
+            self.stderr.write(
+                self.style.WARNING(
+                    f"Could not run {command[0]}, starting Vite as a child process."
+                )
+            )
+
     def discover_vite_apps(self, specified_app_names=None):
-        """Discover all apps with 'fe' directories, or specific apps if provided."""
-        app_configs = []
+        """
+        Discover all apps with 'fe' directories, or specific apps if provided.
+
+        Returns a list of (app_config, fe_dir) pairs.
+        """
+        vite_apps = []
 
         if specified_app_names:
             # Watch only specified apps
             for app_name in specified_app_names:
                 try:
                     app_config = apps.get_app_config(app_name)
-                    fe_dir = os.path.join(app_config.path, "fe")
-                    if os.path.exists(fe_dir):
-                        app_configs.append(app_config)
+                    fe_dir = self.get_fe_dir(app_config)
+                    if fe_dir:
+                        vite_apps.append((app_config, fe_dir))
                     else:
                         self.stderr.write(
                             self.style.WARNING(
@@ -125,51 +187,73 @@ class Command(BaseCommand):
         else:
             # Auto-discover all apps with 'fe' directories
             for app_config in apps.get_app_configs():
-                fe_dir = os.path.join(app_config.path, "fe")
-                if os.path.exists(fe_dir):
-                    app_configs.append(app_config)
+                fe_dir = self.get_fe_dir(app_config)
+                if fe_dir:
+                    vite_apps.append((app_config, fe_dir))
+
+        return vite_apps
 
-        return app_configs
+    def get_fe_dir(self, app_config):
+        """
+        Return the app's 'fe' directory, or None if it has none.
+
+        The result is cached against the mtime of the app directory, which
+        changes when 'fe' is created or removed.
+        """
+        try:
+            mtime = os.stat(app_config.path).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        cached = self._fe_cache.get(app_config.name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        fe_dir = os.path.join(app_config.path, FE_SUBDIR)
+        if not os.path.isdir(fe_dir):
+            fe_dir = None
+        self._fe_cache[app_config.name] = (mtime, fe_dir)
+        return fe_dir
 
     def discover_assets(self, fe_dir, app_name):
         """Discover CSS and JS assets in the frontend directory."""
+        css_files, js_files = discover_fe_assets(fe_dir)
+
+        # Bind the per-file helpers to locals to skip the global/attribute
+        # lookups inside the loops
+        join = os.path.join
+        splitext = os.path.splitext
+        as_posix = PurePath.as_posix
+
         assets = {}
 
-        # Discover CSS files
-        css_dir = os.path.join(fe_dir, "css")
-        if os.path.exists(css_dir):
-            css_files = glob.glob(os.path.join(css_dir, "*.css"))
-            for css_file in css_files:
-                filename = os.path.basename(css_file)
-                name_without_ext = os.path.splitext(filename)[0]
-                rel_path = os.path.relpath(css_file, fe_dir)
-                assets[f"{app_name}-{name_without_ext}-css"] = rel_path
-
-        # Discover JS files (including subdirectories)
-        js_dir = os.path.join(fe_dir, "js")
-        if os.path.exists(js_dir):
-            js_files = glob.glob(os.path.join(js_dir, "**", "*.js"), recursive=True)
-            for js_file in js_files:
-                rel_path = os.path.relpath(js_file, fe_dir)
-                filename = os.path.basename(js_file)
-                name_without_ext = os.path.splitext(filename)[0]
-                # Use relative path for asset name to avoid conflicts
-                path_without_ext = (
-                    os.path.splitext(rel_path)[0].replace("/", "-").replace("\\", "-")
-                )
-                assets[f"{app_name}-{path_without_ext}-js"] = rel_path
+        for filename in css_files:
+            name_without_ext = splitext(filename)[0]
+            assets[f"{app_name}-{name_without_ext}-css"] = join(CSS_SUBDIR, filename)
+
+        for js_file in js_files:
+            rel_path = join(JS_SUBDIR, js_file)
+            # Use relative path for asset name to avoid conflicts
+            posix_path = as_posix(PurePath(rel_path))
+            path_without_ext = posix_path.rsplit(".", 1)[0].replace("/", "-")
+            assets[f"{app_name}-{path_without_ext}-js"] = rel_path
 
         return assets
 
-    def generate_vite_config(self, project_root, app_configs):
-        """Generate a Vite config that watches all specified apps."""
+    def generate_vite_config(self, project_root, vite_apps):
+        """
+        Generate a Vite config that watches all specified apps.
+
+        vite_apps is a list of (app_config, fe_dir) pairs as returned by
+        discover_vite_apps().
+        """
 
         # Collect all watched directories and discover assets
         all_watched_dirs = []
         all_assets = {}
+        join = os.path.join
 
-        for app_config in app_configs:
-            fe_dir = os.path.join(app_config.path, "fe")
+        for app_config, fe_dir in vite_apps:
             rel_fe_dir = os.path.relpath(fe_dir, project_root).replace("\\", "/")
             all_watched_dirs.append(rel_fe_dir)
 
@@ -177,16 +261,9 @@ class Command(BaseCommand):
             assets = self.discover_assets(fe_dir, app_config.name)
             for asset_name, asset_path in assets.items():
                 # Prepend app path to asset path
-                full_asset_path = os.path.join(rel_fe_dir, asset_path).replace(
-                    "\\", "/"
-                )
+                full_asset_path = join(rel_fe_dir, asset_path).replace("\\", "/")
                 all_assets[f"{app_config.name}-{asset_name}"] = full_asset_path
 
-        # Format watched directories for the config
-        watched_dirs_config = ",\n        ".join(
-            [f"resolve('{d}')" for d in all_watched_dirs]
-        )
-
         # Get server configuration from settings
         port = getattr(settings, "DJANGO_UMIN_VITE_DEV_SERVER_PORT", 5173)
         host = getattr(settings, "DJANGO_UMIN_VITE_DEV_SERVER_HOST", "0.0.0.0")
@@ -198,58 +275,33 @@ class Command(BaseCommand):
             allowed_hosts_config = "['.']"
         else:
             # Quote each host and join with commas
-            allowed_hosts_config = (
-                "[" + ", ".join([f"'{h}'" for h in allowed_hosts]) + "]"
-            )
+            hosts = ", ".join(f"'{h}'" for h in allowed_hosts)
+            allowed_hosts_config = f"[{hosts}]"
 
         # HMR configuration for proxied environments (e.g., Codespaces)
-        hmr_config = ""
         hmr_protocol = getattr(settings, "DJANGO_UMIN_VITE_HMR_PROTOCOL", None)
         hmr_host = getattr(settings, "DJANGO_UMIN_VITE_HMR_HOST", None)
         hmr_port = getattr(settings, "DJANGO_UMIN_VITE_HMR_PORT", None)
         hmr_client_port = getattr(settings, "DJANGO_UMIN_VITE_HMR_CLIENT_PORT", None)
 
-        if hmr_protocol or hmr_host or hmr_port or hmr_client_port:
-            hmr_settings = []
-            if hmr_protocol:
-                hmr_settings.append(f"      protocol: '{hmr_protocol}'")
-            if hmr_host:
-                hmr_settings.append(f"      host: '{hmr_host}'")
-            if hmr_port:
-                hmr_settings.append(f"      port: {hmr_port}")
-            if hmr_client_port:
-                hmr_settings.append(f"      clientPort: {hmr_client_port}")
-
-            hmr_config = f"""
-    hmr: {{
-{("," + chr(10)).join(hmr_settings)}
-    }},"""
-
-        # Generate build input entries for asset discovery
-        input_entries = []
-        for asset_name, asset_path in all_assets.items():
-            input_entries.append(f"        '{asset_name}': resolve('{asset_path}')")
-        input_config = ",\n".join(input_entries) if input_entries else ""
-
-        # Add build config if there are input entries
-        build_config = ""
-        if input_config:
-            build_config = f"""
-
-  build: {{
-    rollupOptions: {{
-      input: {{
-{input_config}
-      }}
-    }}
-  }},"""
-
-        return f"""
-import {{ defineConfig }} from 'vite';
-import {{ resolve }} from 'path';
+        hmr_settings = []
+        if hmr_protocol:
+            hmr_settings.append(f"      protocol: '{hmr_protocol}'")
+        if hmr_host:
+            hmr_settings.append(f"      host: '{hmr_host}'")
+        if hmr_port:
+            hmr_settings.append(f"      port: {hmr_port}")
+        if hmr_client_port:
+            hmr_settings.append(f"      clientPort: {hmr_client_port}")
+
+        # Build the config in one list and join once at the end
+        parts = [
+            """
+import { defineConfig } from 'vite';
+import { resolve } from 'path';
 import tailwindcss from '@tailwindcss/vite';
 
-export default defineConfig({{
+export default defineConfig({
   // Use project root as the base to serve from all app directories
   root: resolve('.'),
 
@@ -258,12 +310,36 @@ export default defineConfig({{
 
   plugins: [
     tailwindcss(),
-  ],{build_config}
+  ],"""
+        ]
+
+        # Add build config with the discovered assets as input entries
+        if all_assets:
+            parts.append("\n\n  build: {\n    rollupOptions: {\n      input: {\n")
+            separator = ""
+            for asset_name, asset_path in all_assets.items():
+                parts.append(
+                    f"{separator}        '{asset_name}': resolve('{asset_path}')"
+                )
+                separator = ",\n"
+            parts.append("\n      }\n    }\n  },")
+
+        parts.append(
+            f"""
 
   server: {{
     host: '{host}',
     port: {port},
-    strictPort: false,{hmr_config}
+    strictPort: false,"""
+        )
+
+        if hmr_settings:
+            parts.append("\n    hmr: {\n")
+            parts.append(",\n".join(hmr_settings))
+            parts.append("\n    },")
+
+        parts.append(
+            f"""
 
     // Allow requests from any hostname (Cloudflare tunnels, ngrok, Codespaces, etc.)
     allowedHosts: {allowed_hosts_config},
@@ -285,8 +361,16 @@ export default defineConfig({{
       // Allow serving files from these directories
       allow: [
         resolve('.'),
-        {watched_dirs_config}
-      ],
+"""
+        )
+        for d in all_watched_dirs:
+            parts.append(f"        resolve('{d}'),\n")
+
+        # Watch globs, one per app fe directory
+        watch_globs = ", ".join(f"'{d}/**/*'" for d in all_watched_dirs)
+
+        parts.append(
+            f"""      ],
       // Disable strict file system checks for proxied environments
       strict: false,
     }},
@@ -294,8 +378,22 @@ export default defineConfig({{
     // Watch configuration to include all app fe directories
     watch: {{
       // Watch these directories for changes
-      include: [{", ".join([f"'{d}/**/*'" for d in all_watched_dirs])}],
+      include: [{watch_globs}],
     }}
   }},
 }});
 """
+        )
+        return "".join(parts)
+
+
+def dev_serve(stdout=None, stderr=None, app_names=None, **options):
+    """
+    Run the Vite dev server without going through the command line.
+
+    Accepts the same options as the command (app_names, keep_vite_config):
+
+        from django_umin.management.commands.vite_dev import dev_serve
+        dev_serve(sys.stdout, sys.stderr, app_names=["myapp"])
+    """
+    return Command(stdout=stdout, stderr=stderr).handle(app_names=app_names, **options)
@@ -0,0 +1,128 @@
+"""Helpers shared by the vite_build and vite_dev management commands."""
+
+import os
+
+# Frontend source directory inside each app, and its asset subdirectories
+FE_SUBDIR = "fe"
+CSS_SUBDIR = "css"
+JS_SUBDIR = "js"
+
+# Directories never searched for assets
+SKIP_DIRS = {"node_modules", ".git", "dist"}
+
+# Discovered assets per 'fe' directory: {fe_dir: (dir_mtimes, assets)}, where
+# dir_mtimes maps every directory the discovery looked at to its mtime
+_ASSET_CACHE = {}
+
+# Project roots known to have node_modules. Only hits are remembered, so
+# running `npm install` takes effect without restarting the process.
+_NODE_MODULES_FOUND = set()
+
+
+def has_node_modules(project_root):
+    """Check whether the project has a node_modules directory."""
+    if project_root not in _NODE_MODULES_FOUND:
+        if not os.path.isdir(os.path.join(project_root, "node_modules")):
+            return False
+        _NODE_MODULES_FOUND.add(project_root)
+    return True
+
+
+def iter_files(root, suffix, recursive=True, visited=None):
+    """
+    Yield os.DirEntry objects for files under root ending with suffix.
+
+    Hidden entries, SKIP_DIRS and symlinked directories are skipped, so a
+    symlink loop cannot make the walk recurse forever. Uses os.scandir so
+    file types come from the directory listing instead of a stat() per
+    entry. If
+    visited is a dict, it receives the mtime of every directory listed,
+    taken before the listing so later changes are never missed.
+    """
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        try:
+            if visited is not None:
+                visited[path] = os.stat(path).st_mtime_ns
+            it = os.scandir(path)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(suffix) and entry.is_file():
+                    yield entry
+
+
+def fe_dir_mtimes(*dirs):
+    """Return the mtimes of the given directories (None if missing)."""
+    mtimes = []
+    for path in dirs:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def discover_fe_assets(fe_dir):
+    """
+    Return the (css_files, js_files) found in an app's 'fe' directory.
+
+    css_files are the file names directly inside fe/css, js_files the paths
+    of every .js file below fe/js, relative to it. The result is cached per
+    fe_dir until any directory the discovery walked through changes, so
+    files added or removed in nested directories are picked up too.
+    """
+    cached = _ASSET_CACHE.get(fe_dir)
+    if cached and fe_dir_mtimes(*cached[0]) == tuple(cached[0].values()):
+        return cached[1]
+
+    css_dir = os.path.join(fe_dir, CSS_SUBDIR)
+    js_dir = os.path.join(fe_dir, JS_SUBDIR)
+
+    # fe_dir itself changes when css/ or js/ is created or removed
+    dir_mtimes = {fe_dir: fe_dir_mtimes(fe_dir)[0]}
+
+    # Paths below js_dir start with this prefix; slicing it off is cheaper
+    # than os.path.relpath
+    prefix_len = len(os.path.join(js_dir, ""))
+
+    css_files = tuple(
+        entry.name for entry in iter_files(css_dir, ".css", False, dir_mtimes)
+    )
+    js_files = tuple(
+        entry.path[prefix_len:]
+        for entry in iter_files(js_dir, ".js", visited=dir_mtimes)
+    )
+
+    _ASSET_CACHE[fe_dir] = (dir_mtimes, (css_files, js_files))
+    return css_files, js_files
+
+
+def vite_command(project_root, *args):
+    """
+    Build the command line for running Vite with the given arguments.
+
+    Runs the locally installed Vite entry point with node directly, which
+    avoids npx's package resolution on every start. Falls back to npx when
+    Vite is not installed in the project's node_modules.
+    """
+    vite_bin = os.path.join(project_root, "node_modules", "vite", "bin", "vite.js")
+    if os.path.isfile(vite_bin):
+        return ["node", vite_bin, *args]
+    return ["npx", "vite", *args]
+
+
+def vite_env(params_file=None):
+    """Return the environment for Vite child processes."""
+    env = os.environ.copy()
+    if params_file:
+        env["VITE_UMIN_PARAMS"] = params_file
+    env["NODE_OPTIONS"] = f"{env.get('NODE_OPTIONS', '')} --no-warnings".strip()
+    return env
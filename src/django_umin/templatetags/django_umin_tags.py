@@ -1,5 +1,8 @@
 # crud/templatetags/crud_tags.py
+from functools import lru_cache
+
 from django import template
+from django.urls import reverse
 
 register = template.Library()
 
@@ -7,18 +10,14 @@ register = template.Library()
 @register.filter
 def get_attribute(obj, attr):
     """Get attribute from object."""
-    if obj is None:
-        return ""
-
-    if attr == "__str__":
-        return str(obj)
-
-    # Use Python's built-in getattr function directly
-    import builtins
-
     try:
-        return builtins.getattr(obj, attr)
-    except (AttributeError, TypeError):
+        return (
+            ""
+            if obj is None
+            else (str(obj) if attr == "__str__" else getattr(obj, attr, ""))
+        )
+    except TypeError:
+        # attr is not a string, e.g. {{ obj|get_attribute:0 }}
         return ""
 
 
@@ -37,8 +36,6 @@ def add(value, arg):
 @register.simple_tag
 def crud_url(url_namespace, action, pk=None):
     """Generate CRUD URL."""
-    from django.urls import reverse
-
     url_name = f"{url_namespace}_{action}"
 
     # Use reverse with current_app=None to avoid namespace issues
@@ -81,7 +78,15 @@ def verbose_name_plural(model):
 
 @register.simple_tag
 def get_field_display(obj, field):
-    """Get display value for a field, handling special cases."""
+    """
+    Get display value for a field, handling special cases.
+
+    field is either a field name or an accessor built by
+    CRUDView.build_field_accessors(), which is simply called.
+    """
+    if callable(field):
+        return field(obj)
+
     if field == "__str__":
         return str(obj)
 
@@ -116,44 +121,69 @@ def field_type(field):
     return field.field.__class__.__name__
 
 
+# Widget class name -> kind returned by widget_kind
+_WIDGET_KIND = {
+    "CheckboxInput": "checkbox",
+    "CheckboxSelectMultiple": "checkbox",
+    "Select": "select",
+    "SelectMultiple": "select",
+    "Textarea": "textarea",
+    "FileInput": "file",
+    "ClearableFileInput": "file",
+    "DateInput": "date",
+}
+
+
+@register.filter
+def widget_kind(field):
+    """
+    Get the kind of widget a form field uses.
+
+    Returns "checkbox", "select", "textarea", "file", "date" or "" so
+    templates can switch on one value instead of testing each kind:
+
+        {% with kind=field|widget_kind %}{% if kind == "date" %}...{% endif %}{% endwith %}
+    """
+    # Accept a bound field (field.field.widget) or a form field (field.widget)
+    widget = getattr(getattr(field, "field", field), "widget", None)
+    return _widget_class_kind(type(widget))
+
+
+@lru_cache(maxsize=None)
+def _widget_class_kind(widget_class):
+    # Walk the MRO so subclasses (e.g. NullBooleanSelect) keep their kind
+    for cls in widget_class.__mro__:
+        kind = _WIDGET_KIND.get(cls.__name__)
+        if kind is not None:
+            return kind
+    return ""
+
+
 @register.filter
 def is_checkbox(field):
     """Check if field is a checkbox."""
-    return field.field.widget.__class__.__name__ in [
-        "CheckboxInput",
-        "CheckboxSelectMultiple",
-    ]
+    return widget_kind(field) == "checkbox"
 
 
 @register.filter
 def is_select(field):
     """Check if field is a select."""
-    return field.field.widget.__class__.__name__ in ["Select", "SelectMultiple"]
+    return widget_kind(field) == "select"
 
 
 @register.filter
 def is_textarea(field):
     """Check if field is a textarea."""
-    return field.field.widget.__class__.__name__ == "Textarea"
+    return widget_kind(field) == "textarea"
 
 
 @register.filter
 def is_file(field):
     """Check if field is a file input."""
-    return field.field.widget.__class__.__name__ in ["FileInput", "ClearableFileInput"]
+    return widget_kind(field) == "file"
 
 
 @register.filter
 def is_date(field):
     """Check if field is a date input."""
-    try:
-        # Try to get widget from field.field (Django form field structure)
-        widget = field.field.widget
-    except AttributeError:
-        # If field doesn't have field attribute, try direct widget access
-        try:
-            widget = field.widget
-        except AttributeError:
-            return False
-
-    return widget.__class__.__name__ == "DateInput"
+    return widget_kind(field) == "date"
@@ -7,15 +7,25 @@ from django.apps import apps
 
 register = template.Library()
 
-VITE_DEV_MODE = getattr(settings, "DJANGO_UMIN_VITE_DEV_MODE", False)
-VITE_DEV_SERVER_HOST = getattr(
-    settings, "DJANGO_UMIN_VITE_DEV_SERVER_HOST", "localhost"
-)
-VITE_DEV_SERVER_PORT = getattr(settings, "DJANGO_UMIN_VITE_DEV_SERVER_PORT", 5173)
-VITE_DEV_SERVER_PROTOCOL = getattr(
-    settings, "DJANGO_UMIN_VITE_DEV_SERVER_PROTOCOL", "http"
-)
-VITE_DEV_SERVER_URL = getattr(settings, "DJANGO_UMIN_VITE_DEV_SERVER_URL", None)
+
+def _dev_server_url():
+    """
+    Base URL of the Vite dev server.
+
+    Settings are read on each call rather than at import time, so changes
+    (e.g. in tests or override_settings) take effect without a reload.
+    """
+    # Support proxied environments (e.g., GitHub Codespaces) by allowing full URL override
+    url = getattr(settings, "DJANGO_UMIN_VITE_DEV_SERVER_URL", None)
+    if url:
+        # Use explicit dev server URL (e.g., "https://codespace-5173.app.github.dev")
+        return url.rstrip("/")
+
+    # Construct from host, port, and protocol (default: http://localhost:5173)
+    protocol = getattr(settings, "DJANGO_UMIN_VITE_DEV_SERVER_PROTOCOL", "http")
+    host = getattr(settings, "DJANGO_UMIN_VITE_DEV_SERVER_HOST", "localhost")
+    port = getattr(settings, "DJANGO_UMIN_VITE_DEV_SERVER_PORT", 5173)
+    return f"{protocol}://{host}:{port}"
 
 
 @register.simple_tag
@@ -24,15 +34,9 @@ def vite_asset(path, app):
     Generates <script> or <link> tags for a Vite asset.
     Handles both development and production modes.
     """
-    if VITE_DEV_MODE:
+    if getattr(settings, "DJANGO_UMIN_VITE_DEV_MODE", False):
         # In development, generate URLs to the project-level Vite dev server
-        # Support proxied environments (e.g., GitHub Codespaces) by allowing full URL override
-        if VITE_DEV_SERVER_URL:
-            # Use explicit dev server URL (e.g., "https://codespace-5173.app.github.dev")
-            base_url = VITE_DEV_SERVER_URL.rstrip("/")
-        else:
-            # Construct from host, port, and protocol (default: http://localhost:5173)
-            base_url = f"{VITE_DEV_SERVER_PROTOCOL}://{VITE_DEV_SERVER_HOST}:{VITE_DEV_SERVER_PORT}"
+        base_url = _dev_server_url()
 
         # The @vite/client script is a special case and is served from the root.
         if path == "@vite/client":
@@ -1,4 +1,6 @@
 # crud/urls.py
+from itertools import chain
+
 from django.urls import path
 from .views import (
     CRUDListView,
@@ -14,6 +16,11 @@ class CRUDRegistry:
 
     def __init__(self):
         self._registry = {}
+        # URL patterns per model, built once at registration
+        self._compiled = {}
+        # Index page entry per model, and the grouped index built from them
+        self._index_entries = {}
+        self._index_cache = None
 
     def register(self, crud_view_class):
         """
@@ -30,24 +37,48 @@ class CRUDRegistry:
         crud_instance = crud_view_class()
         model_name = crud_instance.model._meta.model_name
         self._registry[model_name] = crud_instance
+        self._compiled[model_name] = self._generate_urls(crud_instance, model_name)
+        self._index_entries[model_name] = self._index_entry(crud_instance)
+        self._index_cache = None
         return crud_view_class
 
+    def build_index(self):
+        """
+        Return (app_models, total_models) for the index page.
+
+        app_models maps each app label to the entries of its registered
+        models. The result is built once and reused until the next register().
+        """
+        if self._index_cache is None:
+            app_models = {}
+            for entry in self._index_entries.values():
+                app_models.setdefault(entry["app_label"], []).append(entry)
+            self._index_cache = (app_models, len(self._index_entries))
+        return self._index_cache
+
+    def _index_entry(self, crud_view):
+        """Build the index page entry for a single CRUD view."""
+        meta = crud_view.model._meta
+        return {
+            "name": meta.verbose_name_plural,
+            "model_name": meta.model_name,
+            "app_label": meta.app_label,
+            "list_url": f"/{meta.model_name}/",  # Will be overridden by template
+            "add_url": f"/{meta.model_name}/create/",  # Will be overridden by template
+            "verbose_name": meta.verbose_name,
+            "list_url_name": f"{meta.model_name}_list",
+            "add_url_name": f"{meta.model_name}_create",
+        }
+
     def get_urls(self):
         """Generate URL patterns for all registered CRUD views including index."""
-        urlpatterns = [
+        return [
             path("", CRUDIndexView.as_view(), name="crud_index"),
+            *chain.from_iterable(self._compiled.values()),
         ]
 
-        for model_name, crud_view in self._registry.items():
-            patterns = self._generate_urls(crud_view)
-            urlpatterns.extend(patterns)
-
-        return urlpatterns
-
-    def _generate_urls(self, crud_view):
+    def _generate_urls(self, crud_view, model_name):
         """Generate URL patterns for a single CRUD view."""
-        model_name = crud_view.model._meta.model_name
-
         return [
             path(
                 f"{model_name}/",
@@ -1,12 +1,134 @@
 # django_umin/views.py
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import lru_cache, reduce
+from operator import attrgetter, itemgetter, methodcaller, or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Field, Q
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.contrib.admin.utils import flatten_fieldsets
 from django.forms import modelform_factory
 from django.urls import reverse
-from django.http import HttpResponse
+from django.utils.functional import cached_property
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
-from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+
+from .actions import delete_selected
+
+
+def is_htmx(request):
+    """Check whether request was made by HTMX, caching the answer on it."""
+    try:
+        return request._is_htmx
+    except AttributeError:
+        request._is_htmx = bool(request.headers.get("HX-Request"))
+        return request._is_htmx
+
+
+# Fields that are good for display, in order of preference
+DEFAULT_DISPLAY_FIELDS = (
+    "name",
+    "title",
+    "slug",
+    "email",
+    "username",
+    "first_name",
+    "last_name",
+)
+
+
+@lru_cache(maxsize=None)
+def _default_display_field(model):
+    """Name of the first DEFAULT_DISPLAY_FIELDS field on model, or None."""
+    for field_name in DEFAULT_DISPLAY_FIELDS:
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            continue
+        if isinstance(field, Field):
+            return field_name
+    return None
+
+
+@lru_cache(maxsize=None)
+def _editable_field_names(model):
+    """Names of the editable, non-auto-created fields of model, computed once."""
+    field_names = []
+    for field in model._meta.get_fields():
+        # Skip non-field attributes
+        if not hasattr(field, "name"):
+            continue
+
+        # Skip auto-created fields (like id)
+        if hasattr(field, "auto_created") and field.auto_created:
+            continue
+
+        # Skip non-editable fields
+        if hasattr(field, "editable") and not field.editable:
+            continue
+
+        field_names.append(field.name)
+    return tuple(field_names)
+
+
+class CountFreePage(Page):
+    """Page of a CountFreePaginator, which knows if a next page exists."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1
+
+
+class CountFreePaginator(Paginator):
+    """
+    Paginator that never runs COUNT(*) on the object list.
+
+    Each page fetches per_page + 1 rows; the extra row only tells whether
+    there is a next page. count and num_pages are None and page_range is
+    empty, so templates should rely on has_next/has_previous.
+    """
+
+    count = None
+    num_pages = None
+    page_range = ()
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage("That page contains no results")
+        return CountFreePage(
+            rows[: self.per_page], number, self, has_next=len(rows) > self.per_page
+        )
+
+
+class HTMXMixin:
+    """Read the HX-Request header once per request into request._is_htmx."""
+
+    def dispatch(self, request, *args, **kwargs):
+        is_htmx(request)
+        return super().dispatch(request, *args, **kwargs)
 
 
 class CRUDView:
@@ -31,9 +153,17 @@ class CRUDView:
     list_display = None
     list_display_links = None
     search_fields = []
+    search_mode = "icontains"  # or "fulltext" (PostgreSQL only)
+    search_vector_field = None
     list_filter = []
     ordering = None
     paginate_by = 25
+    pagination_style = "offset"  # or "keyset", which requires ordering
+    count_free_pagination = False  # Offset pages without COUNT(*)
+    list_select_related = None  # None derives it from list_display
+    list_prefetch_related = None
+    defer_enabled = True  # Load only the list_display columns
+    values_mode = False  # Render list rows from values() dicts
 
     # Form configuration
     fields = None
@@ -70,56 +200,92 @@ class CRUDView:
         if self.list_display is None:
             # Provide sensible defaults for list_display
             # Try to use common fields, falling back to __str__
-            from django.db import models as django_models
-            from django.core.exceptions import FieldDoesNotExist
-
-            field_names = []
-
-            # Look for common fields that are good for display
-            common_fields = [
-                "name",
-                "title",
-                "slug",
-                "email",
-                "username",
-                "first_name",
-                "last_name",
-            ]
-            for field_name in common_fields:
-                try:
-                    field = self.model._meta.get_field(field_name)
-                    if isinstance(field, django_models.Field):
-                        field_names.append(field_name)
-                        break  # Use the first common field found
-                except FieldDoesNotExist:
-                    pass
-
-            if field_names:
-                self.list_display = field_names
-            else:
-                # Fall back to __str__ method
-                self.list_display = ["__str__"]
+            field_name = _default_display_field(self.model)
+            self.list_display = [field_name or "__str__"]
 
         if self.list_display_links is None:
             self.list_display_links = [self.list_display[0]]
 
+        # Cache model metadata read on every request
+        self._meta = self.model._meta
+        self.verbose_name = self._meta.verbose_name
+        self.verbose_name_plural = self._meta.verbose_name_plural
+        self.url_namespace = self._meta.model_name
+        self._list_url_name = f"{self.url_namespace}_list"
+        self._search_keys = tuple(f"{f}__icontains" for f in (self.search_fields or ()))
+        if self.list_select_related is None:
+            self.list_select_related = self._derive_select_related()
+        self._keyset_ordering, self._keyset_keys = self._build_keyset()
+        if self._keyset_keys and isinstance(self.list_select_related, (list, tuple)):
+            # encode_cursor() reads the ordering values of the last row, so
+            # join the relations they live on instead of a query per page
+            related = list(self.list_select_related)
+            for path, _, _ in self._keyset_keys:
+                relation = path.rpartition("__")[0]
+                if relation and relation not in related:
+                    related.append(relation)
+            self.list_select_related = related
+        self._only_fields = self._derive_only_fields() if self.defer_enabled else None
+        self._values_mode = self._can_use_values()
+        if self._values_mode and self._keyset_keys:
+            # Cursor values are read from the row dicts
+            self._keyset_keys = [
+                (path, lookup, itemgetter(path)) for path, lookup, _ in self._keyset_keys
+            ]
+        self._default_fields = self._discover_form_fields()
+        self._form_class_cache = None
+
+        # Bulk actions by name, and (name, description) pairs for the select
+        self._action_map = {}
+        self._action_choices = []
+        for action in self.get_actions():
+            if callable(action):
+                func_name = action.__name__ if hasattr(action, "__name__") else str(action)
+                description = getattr(action, "short_description", func_name.replace("_", " ").title())
+                self._action_map.setdefault(func_name, action)
+                self._action_choices.append((func_name, description))
+
+        # Partial template for each base template served to HTMX requests
+        suffix = self.htmx_template_suffix
+        self._htmx_templates = {
+            t: t.replace(".html", f"{suffix}.html")
+            for t in (self.list_template, self.form_template, self.delete_template)
+        }
+        # Reused get_template_names() results: {(template, is_htmx): names}
+        self._template_names = {}
+        for t, htmx_template in self._htmx_templates.items():
+            self._template_names[(t, False)] = (t,)
+            self._template_names[(t, True)] = (htmx_template,)
+
     def get_queryset(self, request):
         """Get base queryset with search and filtering applied."""
         queryset = self.model.objects.all()
 
+        # Fetch related objects shown in the list with the rows
+        if self.list_select_related:
+            queryset = queryset.select_related(*self.list_select_related)
+        if self.list_prefetch_related:
+            queryset = queryset.prefetch_related(*self.list_prefetch_related)
+
+        # Skip the columns the list does not render
+        if self._only_fields:
+            queryset = queryset.only(*self._only_fields)
+
         # Apply ordering
-        if self.ordering:
+        if self._keyset_ordering:
+            queryset = queryset.order_by(*self._keyset_ordering)
+        elif self.ordering:
             queryset = queryset.order_by(*self.ordering)
 
         # Apply search
         search_query = request.GET.get("q", "")
-        if search_query and self.search_fields:
-            from django.db.models import Q
-
-            query = Q()
-            for field in self.search_fields:
-                query |= Q(**{f"{field}__icontains": search_query})
-            queryset = queryset.filter(query)
+        if search_query:
+            if self.search_mode == "fulltext":
+                queryset = self.fulltext_search(queryset, search_query)
+            elif self._search_keys:
+                queryset = queryset.filter(
+                    reduce(or_, (Q(**{k: search_query}) for k in self._search_keys))
+                )
 
         # Apply filters
         for filter_field in self.list_filter:
@@ -129,70 +295,345 @@ class CRUDView:
 
         return queryset
 
-    def get_form_class(self):
-        """Get form class using admin-style configuration."""
-        if self.form_class:
-            return self.form_class
+    def fulltext_search(self, queryset, search_query):
+        """
+        Filter queryset with PostgreSQL full-text search.
+
+        Uses search_vector_field (a SearchVectorField backed by a GIN index)
+        when set, otherwise builds a SearchVector over search_fields for each
+        query, which works without an index but still scans the table.
+        """
+        from django.contrib.postgres.search import SearchQuery, SearchVector
+
+        query = SearchQuery(search_query, search_type="websearch")
+        if self.search_vector_field:
+            return queryset.filter(**{self.search_vector_field: query})
+        if not self.search_fields:
+            return queryset
+        return queryset.annotate(
+            _search_vector=SearchVector(*self.search_fields)
+        ).filter(_search_vector=query)
+
+    def _derive_select_related(self):
+        """
+        Collect the forward foreign key and one-to-one paths in list_display.
+
+        'author' and 'author__publisher__name' yield 'author' and
+        'author__publisher', so rendering the list does not run one query
+        per row and relation.
+        """
+        paths = []
+        for name in self.list_display:
+            model = self.model
+            path = []
+            for part in name.split("__"):
+                try:
+                    field = model._meta.get_field(part)
+                except FieldDoesNotExist:
+                    break
+                if not (field.many_to_one or field.one_to_one) or field.auto_created:
+                    break
+                path.append(part)
+                model = field.related_model
+            if path:
+                related = "__".join(path)
+                if related not in paths:
+                    paths.append(related)
+        return paths
+
+    def _is_field_path(self, name):
+        """Check that name is a concrete field, possibly across forward relations."""
+        model = self.model
+        *relations, last = name.split("__")
+        try:
+            for part in relations:
+                field = model._meta.get_field(part)
+                if not (field.many_to_one or field.one_to_one) or not field.concrete:
+                    return False
+                model = field.related_model
+            return model._meta.get_field(last).concrete
+        except FieldDoesNotExist:
+            return False
+
+    def _derive_only_fields(self):
+        """
+        Collect the columns the list view renders, for queryset.only().
+
+        Returns None when a list_display entry is not a field path (__str__,
+        a model method or property), since those may read any column and
+        deferring would cost a query per row instead of saving bandwidth.
+        For the same reason a relation shown as a whole ('author') loads
+        every column of the related row, even if other entries only name
+        some of them ('author__name'). The relations in list_select_related
+        and list_prefetch_related keep their foreign key columns too.
+        """
+        names = list(self.list_display)
+        if self._keyset_ordering:
+            # encode_cursor() reads the ordering values of the last row
+            names.extend(name.lstrip("-") for name in self._keyset_ordering)
+
+        only_fields = ["pk"]
+        for name in names:
+            if name == "pk" or name in only_fields:
+                continue
+            if not self._is_field_path(name):
+                return None
+            only_fields.append(name)
+
+        # select_related() cannot traverse a deferred foreign key, and a
+        # prefetch would read each deferred key with a query per row
+        related = list(self.list_select_related or ())
+        for lookup in self.list_prefetch_related or ():
+            related.append(getattr(lookup, "prefetch_through", lookup).split("__")[0])
+        for name in related:
+            if name not in only_fields and self._is_relation_path(name):
+                only_fields.append(name)
+
+        relations = [name for name in only_fields[1:] if self._is_relation_path(name)]
+        return [
+            name
+            for name in only_fields
+            if not any(name.startswith(f"{relation}__") for relation in relations)
+        ]
 
+    def _is_relation_path(self, name):
+        """Check that a field path ends in a forward foreign key or one-to-one."""
+        model = self.model
+        try:
+            for part in name.split("__"):
+                field = model._meta.get_field(part)
+                model = field.related_model
+        except (AttributeError, FieldDoesNotExist):
+            # e.g. a reverse accessor such as 'book_set'
+            return False
+        return (field.many_to_one or field.one_to_one) and not field.auto_created
+
+    def _can_use_values(self):
+        """
+        Check whether list rows can be fetched with values() when values_mode is set.
+
+        Every list_display entry must be a plain column: __str__, methods
+        and properties need model instances, and a foreign key would render
+        as its raw id instead of the related object.
+        """
+        if not self.values_mode or not self._only_fields or self.list_prefetch_related:
+            return False
+        for name in self.list_display:
+            if name == "pk":
+                continue
+            model = self.model
+            *relations, last = name.split("__")
+            for part in relations:
+                model = model._meta.get_field(part).related_model
+            if model._meta.get_field(last).is_relation:
+                return False
+        return True
+
+    def _build_keyset(self):
+        """
+        Resolve the ordering used by keyset pagination.
+
+        Returns the ordering, with the primary key appended as a tie-breaker,
+        and a (path, lookup, getter) triple per ordering key. Both are None
+        unless pagination_style is "keyset", paginate_by is set and ordering
+        is a list of field names, so pagination falls back to offset mode
+        otherwise. Raises ValueError for an ordering field that can be NULL.
+        """
+        if self.pagination_style != "keyset" or not self.ordering:
+            return None, None
+        if not self.paginate_by:
+            return None, None
+        if not all(isinstance(name, str) for name in self.ordering):
+            return None, None
+
+        ordering = list(self.ordering)
+        pk_names = ("pk", self._meta.pk.name)
+        if not any(name.lstrip("-") in pk_names for name in ordering):
+            ordering.append("pk")
+
+        keys = []
+        for name in ordering:
+            path = name.lstrip("-")
+            lookup = f"{path}__{'lt' if name.startswith('-') else 'gt'}"
+            keys.append((path, lookup, self._keyset_getter(path)))
+        return tuple(ordering), keys
+
+    def _keyset_getter(self, path):
+        """
+        Return a getter reading the value of one keyset ordering path.
+
+        NULLs cannot be compared with __gt/__lt, so a cursor could never
+        seek past them: a path that can be NULL raises ValueError.
+        """
+        if path == "pk":
+            return attrgetter("pk")
+
+        model = self.model
+        attrs = []
+        try:
+            for part in path.split("__"):
+                field = model._meta.get_field(part)
+                if field.null:
+                    raise ValueError(
+                        f"{type(self).__name__}.ordering: '{path}' can be NULL, "
+                        "which keyset pagination cannot page through. Order by "
+                        "non-nullable fields or use pagination_style = 'offset'."
+                    )
+                attrs.append(field.name)
+                model = field.related_model
+        except (AttributeError, FieldDoesNotExist):
+            # Not a plain field path, e.g. an annotation
+            return attrgetter(path.replace("__", "."))
+
+        if field.concrete:
+            # The raw column value, e.g. author_id for a foreign key
+            attrs[-1] = field.attname
+        return attrgetter(".".join(attrs))
+
+    def encode_cursor(self, obj):
+        """Encode the ordering values of obj as an opaque cursor string."""
+        values = [getter(obj) for _, _, getter in self._keyset_keys]
+        data = json.dumps(values, cls=DjangoJSONEncoder, separators=(",", ":"))
+        return urlsafe_b64encode(data.encode()).decode()
+
+    def apply_cursor(self, queryset, cursor):
+        """
+        Filter queryset to the rows that come after cursor.
+
+        For ordering (a, b) this is a > x OR (a = x AND b > y), so the
+        database can seek on the ordering index instead of skipping rows
+        with OFFSET. Raises Http404 for a malformed cursor.
+        """
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+        except ValueError:
+            raise Http404("Invalid cursor")
+        if not isinstance(values, list) or len(values) != len(self._keyset_keys):
+            raise Http404("Invalid cursor")
+
+        clauses = []
+        equal = {}
+        for (path, lookup, _), value in zip(self._keyset_keys, values):
+            clauses.append(Q(**equal, **{lookup: value}))
+            equal[path] = value
+        try:
+            return queryset.filter(reduce(or_, clauses))
+        except (TypeError, ValueError, ValidationError):
+            raise Http404("Invalid cursor")
+
+    def build_field_accessors(self):
+        """
+        Build a (field, accessor) pair for each field in list_display.
+
+        Each accessor takes an object and returns the value to display for
+        that field. The model is inspected once per field here, rather than
+        once per table cell while rendering.
+        """
+        return [(field, self._field_accessor(field)) for field in self.list_display]
+
+    def _field_accessor(self, field):
+        if field == "__str__":
+            getter = str
+        else:
+            try:
+                model_field = self._meta.get_field(field)
+            except FieldDoesNotExist:
+                model_field = None
+
+            if self._values_mode and getattr(model_field, "choices", None):
+                # Look up the choice label for the value in the row dict
+                labels = dict(model_field.flatchoices)
+
+                def getter(row):
+                    value = row[field]
+                    return labels.get(value, value)
+
+            elif self._values_mode:
+                getter = itemgetter(field)
+            elif getattr(model_field, "choices", None):
+                # Show the choice label instead of the stored value
+                getter = methodcaller(f"get_{field}_display")
+            elif callable(getattr(self.model, field, None)):
+                getter = methodcaller(field)
+            else:
+                # 'author__name' reads obj.author.name
+                getter = attrgetter(field.replace("__", "."))
+
+        def accessor(obj):
+            try:
+                value = getter(obj)
+            except (AttributeError, KeyError, TypeError):
+                return "-"
+            if value is None:
+                return "-"
+            if isinstance(value, bool):
+                return "✓" if value else "✗"
+            return value
+
+        # Otherwise the template engine calls it without arguments
+        accessor.do_not_call_in_templates = True
+        return accessor
+
+    def _discover_form_fields(self):
+        """Resolve the form fields from fields, fieldsets or the model."""
         fields = self.fields
         if self.fieldsets:
             fields = flatten_fieldsets(self.fieldsets)
 
         # Provide sensible defaults if fields and exclude are not defined
         if not fields and not self.exclude:
-            # Use all fields by default, excluding auto fields and non-editable fields
-            from django.db import models as django_models
-            from django.core.exceptions import FieldError
+            # Use all fields by default, excluding auto fields and non-editable
+            # fields, or '__all__' if no fields found
+            fields = list(_editable_field_names(self.model)) or "__all__"
 
-            field_names = []
-            for field in self.model._meta.get_fields():
-                # Skip non-field attributes
-                if not hasattr(field, "name"):
-                    continue
+        return fields
 
-                # Skip auto-created fields (like id)
-                if hasattr(field, "auto_created") and field.auto_created:
-                    continue
-
-                # Skip non-editable fields
-                if hasattr(field, "editable") and not field.editable:
-                    continue
-
-                # Include the field
-                field_names.append(field.name)
-
-            if field_names:
-                fields = field_names
-            else:
-                # Fallback to '__all__' if no fields found
-                fields = "__all__"
+    def get_form_class(self):
+        """Get form class using admin-style configuration."""
+        if self.form_class:
+            return self.form_class
 
-        return modelform_factory(self.model, fields=fields, exclude=self.exclude)
+        # The generated class only depends on the configuration, so build it
+        # once instead of on every create/update request
+        if self._form_class_cache is None:
+            self._form_class_cache = modelform_factory(
+                self.model, fields=self._default_fields, exclude=self.exclude
+            )
+        return self._form_class_cache
 
     def get_template_name(self, base_template, request):
         """Get template name with HTMX support."""
-        if request.headers.get("HX-Request"):
+        if is_htmx(request):
             # Return partial template for HTMX requests
-            return base_template.replace(".html", f"{self.htmx_template_suffix}.html")
+            htmx_template = self._htmx_templates.get(base_template)
+            if htmx_template is None:
+                htmx_template = base_template.replace(
+                    ".html", f"{self.htmx_template_suffix}.html"
+                )
+            return htmx_template
         return base_template
 
+    @cached_property
+    def list_url(self):
+        """URL of the list view, reversed once on first use."""
+        return reverse(self._list_url_name)
+
     def get_success_url(self, obj=None):
         """Get URL to redirect to after successful form submission."""
-        return reverse(f"{self.get_url_namespace()}_list")
+        return self.list_url
 
     def get_url_namespace(self):
         """Get URL namespace for this CRUD."""
-        return self.model._meta.model_name
+        return self.url_namespace
 
-    def format_message(self, template, obj):
-        """Format success message with object."""
-        return template.format(object=str(obj))
+    def format_message(self, template, obj_str):
+        """Format success message with the object's string representation."""
+        return template.format_map({"object": obj_str})
 
     def get_actions(self):
         """Get list of available actions for this view."""
         if self.actions is None:
             # Default actions
-            from .actions import delete_selected
             return [delete_selected]
         elif self.actions == []:
             # Explicitly disabled
@@ -200,7 +641,7 @@ class CRUDView:
         return self.actions
 
 
-class CRUDListView(ListView):
+class CRUDListView(HTMXMixin, ListView):
     """List view for CRUD operations."""
 
     crud_view = None
@@ -216,24 +657,16 @@ class CRUDListView(ListView):
 
         if not action_name or not selected_ids:
             messages.error(request, "No action or items selected.")
-            return redirect(reverse(f"{self.crud_view.get_url_namespace()}_list"))
+            return redirect(self.crud_view.list_url)
 
         # Get the queryset of selected objects
         queryset = self.crud_view.model.objects.filter(pk__in=selected_ids)
 
         # Find the action function
-        actions = self.crud_view.get_actions()
-        action_func = None
-        for action in actions:
-            if callable(action):
-                func_name = action.__name__ if hasattr(action, "__name__") else str(action)
-                if func_name == action_name:
-                    action_func = action
-                    break
-
+        action_func = self.crud_view._action_map.get(action_name)
         if not action_func:
             messages.error(request, f"Unknown action: {action_name}")
-            return redirect(reverse(f"{self.crud_view.get_url_namespace()}_list"))
+            return redirect(self.crud_view.list_url)
 
         # Execute the action
         response = action_func(self.crud_view, request, queryset)
@@ -243,50 +676,76 @@ class CRUDListView(ListView):
             return response
 
         # Otherwise redirect back to list view
-        return redirect(reverse(f"{self.crud_view.get_url_namespace()}_list"))
+        return redirect(self.crud_view.list_url)
 
     def get_queryset(self):
-        return self.crud_view.get_queryset(self.request)
+        queryset = self.crud_view.get_queryset(self.request)
+        if self.crud_view._values_mode:
+            # Rows are dicts of just the rendered columns, not model instances
+            queryset = queryset.values(*self.crud_view._only_fields)
+        if self.crud_view._keyset_ordering:
+            cursor = self.request.GET.get("cursor")
+            if cursor:
+                queryset = self.crud_view.apply_cursor(queryset, cursor)
+            # One extra row tells whether there is a next page
+            queryset = queryset[: self.crud_view.paginate_by + 1]
+        return queryset
 
     def get_template_names(self):
-        return [
-            self.crud_view.get_template_name(self.crud_view.list_template, self.request)
+        return self.crud_view._template_names[
+            (self.crud_view.list_template, self.request._is_htmx)
         ]
 
+    def get_paginator(self, queryset, per_page, **kwargs):
+        if self.crud_view.count_free_pagination:
+            return CountFreePaginator(queryset, per_page)
+        return super().get_paginator(queryset, per_page, **kwargs)
+
     def get_paginate_by(self, queryset):
+        if self.crud_view._keyset_ordering:
+            # get_queryset() already limited the rows
+            return None
         return self.crud_view.paginate_by
 
     def get_context_data(self, **kwargs):
+        next_cursor = None
+        # Keyset links keep the search and filter params, with only the
+        # cursor replaced
+        params = self.request.GET.copy()
+        params.pop("cursor", None)
+        first_page_query = params.urlencode()
+        next_page_query = ""
+        if self.crud_view._keyset_ordering:
+            rows = list(self.object_list)
+            page_size = self.crud_view.paginate_by
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = self.crud_view.encode_cursor(rows[-1])
+                params["cursor"] = next_cursor
+                next_page_query = params.urlencode()
+            kwargs["object_list"] = rows
+
         context = super().get_context_data(**kwargs)
-        
-        # Get available actions
-        actions = self.crud_view.get_actions()
-        action_choices = []
-        for action in actions:
-            if callable(action):
-                func_name = action.__name__ if hasattr(action, "__name__") else str(action)
-                description = getattr(action, "short_description", func_name.replace("_", " ").title())
-                action_choices.append((func_name, description))
-        
-        context.update(
-            {
-                "crud_view": self.crud_view,
-                "model_name": self.crud_view.model._meta.verbose_name,
-                "model_name_plural": self.crud_view.model._meta.verbose_name_plural,
-                "search_query": self.request.GET.get("q", ""),
-                "list_display": self.crud_view.list_display,
-                "list_display_links": self.crud_view.list_display_links,
-                "has_add_permission": True,  # Add permission checking here
-                "url_namespace": self.crud_view.get_url_namespace(),
-                "actions": action_choices,
-                "actions_on_top": self.crud_view.actions_on_top,
-                "actions_on_bottom": self.crud_view.actions_on_bottom,
-            }
-        )
+        context["crud_view"] = self.crud_view
+        context["model_name"] = self.crud_view.verbose_name
+        context["model_name_plural"] = self.crud_view.verbose_name_plural
+        context["search_query"] = self.request.GET.get("q", "")
+        context["list_display"] = self.crud_view.list_display
+        context["list_display_links"] = self.crud_view.list_display_links
+        context["field_accessors"] = self.crud_view.build_field_accessors()
+        context["has_add_permission"] = True  # Add permission checking here
+        context["url_namespace"] = self.crud_view.url_namespace
+        context["actions"] = self.crud_view._action_choices
+        context["actions_on_top"] = self.crud_view.actions_on_top
+        context["actions_on_bottom"] = self.crud_view.actions_on_bottom
+        context["cursor"] = self.request.GET.get("cursor", "")
+        context["next_cursor"] = next_cursor
+        context["first_page_query"] = first_page_query
+        context["next_page_query"] = next_page_query
         return context
 
 
-class CRUDCreateView(CreateView):
+class CRUDCreateView(HTMXMixin, CreateView):
     """Create view for CRUD operations."""
 
     crud_view = None
@@ -299,8 +758,8 @@ class CRUDCreateView(CreateView):
         return self.crud_view.get_form_class()
 
     def get_template_names(self):
-        return [
-            self.crud_view.get_template_name(self.crud_view.form_template, self.request)
+        return self.crud_view._template_names[
+            (self.crud_view.form_template, self.request._is_htmx)
         ]
 
     def get_success_url(self):
@@ -309,30 +768,26 @@ class CRUDCreateView(CreateView):
     def form_valid(self, form):
         response = super().form_valid(form)
         msg = self.crud_view.format_message(
-            self.crud_view.success_message_create, self.object
+            self.crud_view.success_message_create, str(self.object)
         )
         messages.success(self.request, msg)
 
         # For HTMX requests, return a redirect trigger
-        if self.request.headers.get("HX-Request"):
+        if self.request._is_htmx:
             response["HX-Redirect"] = self.get_success_url()
 
         return response
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context.update(
-            {
-                "crud_view": self.crud_view,
-                "model_name": self.crud_view.model._meta.verbose_name,
-                "action": "Create",
-                "url_namespace": self.crud_view.get_url_namespace(),
-            }
-        )
+        context["crud_view"] = self.crud_view
+        context["model_name"] = self.crud_view.verbose_name
+        context["action"] = "Create"
+        context["url_namespace"] = self.crud_view.url_namespace
         return context
 
 
-class CRUDUpdateView(UpdateView):
+class CRUDUpdateView(HTMXMixin, UpdateView):
     """Update view for CRUD operations."""
 
     crud_view = None
@@ -348,8 +803,8 @@ class CRUDUpdateView(UpdateView):
         return self.crud_view.get_form_class()
 
     def get_template_names(self):
-        return [
-            self.crud_view.get_template_name(self.crud_view.form_template, self.request)
+        return self.crud_view._template_names[
+            (self.crud_view.form_template, self.request._is_htmx)
         ]
 
     def get_success_url(self):
@@ -358,29 +813,25 @@ class CRUDUpdateView(UpdateView):
     def form_valid(self, form):
         response = super().form_valid(form)
         msg = self.crud_view.format_message(
-            self.crud_view.success_message_update, self.object
+            self.crud_view.success_message_update, str(self.object)
         )
         messages.success(self.request, msg)
 
-        if self.request.headers.get("HX-Request"):
+        if self.request._is_htmx:
             response["HX-Redirect"] = self.get_success_url()
 
         return response
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context.update(
-            {
-                "crud_view": self.crud_view,
-                "model_name": self.crud_view.model._meta.verbose_name,
-                "action": "Update",
-                "url_namespace": self.crud_view.get_url_namespace(),
-            }
-        )
+        context["crud_view"] = self.crud_view
+        context["model_name"] = self.crud_view.verbose_name
+        context["action"] = "Update"
+        context["url_namespace"] = self.crud_view.url_namespace
         return context
 
 
-class CRUDDeleteView(DeleteView):
+class CRUDDeleteView(HTMXMixin, DeleteView):
     """Delete view for CRUD operations."""
 
     crud_view = None
@@ -393,64 +844,31 @@ class CRUDDeleteView(DeleteView):
         return self.crud_view.model.objects.all()
 
     def get_template_names(self):
-        return [
-            self.crud_view.get_template_name(
-                self.crud_view.delete_template, self.request
-            )
+        return self.crud_view._template_names[
+            (self.crud_view.delete_template, self.request._is_htmx)
         ]
 
     def get_success_url(self):
         return self.crud_view.get_success_url()
 
     def form_valid(self, form):
-        obj = self.get_object()
-        msg = self.crud_view.format_message(self.crud_view.success_message_delete, obj)
+        # DeleteView.post() has already fetched the object
+        obj_str = str(self.object)
+        msg = self.crud_view.format_message(
+            self.crud_view.success_message_delete, obj_str
+        )
         response = super().form_valid(form)
 
-        if self.request.headers.get("HX-Request"):
-            # For HTMX requests, return the updated list content instead of redirecting
-            # This ensures the UI updates immediately and the success message is shown
-            from django.template.loader import render_to_string
-            from django.contrib import messages
-
+        if self.request._is_htmx:
+            # For HTMX requests the deleted row is the swap target: answer
+            # with an empty body so it is removed, plus the success message
+            # swapped in out of band, instead of re-querying and
+            # re-rendering the whole list
             messages.success(self.request, msg)
-
-            # Get the updated queryset
-            queryset = self.crud_view.get_queryset(self.request)
-
-            # Render the list content with messages
-            context = {
-                "object_list": queryset,
-                "crud_view": self.crud_view,
-                "model_name": self.crud_view.model._meta.verbose_name,
-                "model_name_plural": self.crud_view.model._meta.verbose_name_plural,
-                "search_query": self.request.GET.get("q", ""),
-                "list_display": self.crud_view.list_display,
-                "list_display_links": self.crud_view.list_display_links,
-                "has_add_permission": True,
-                "url_namespace": self.crud_view.get_url_namespace(),
-                "messages": list(messages.get_messages(self.request)),
-            }
-
-            # Check if pagination is needed
-            paginate_by = self.crud_view.paginate_by
-            if paginate_by:
-                paginator = Paginator(queryset, paginate_by)
-                page_number = self.request.GET.get("page", 1)
-                page_obj = paginator.get_page(page_number)
-                context.update(
-                    {
-                        "page_obj": page_obj,
-                        "paginator": paginator,
-                        "is_paginated": True,
-                    }
-                )
-            else:
-                context["is_paginated"] = False
-
-            # Render the table content only (for HTMX responses)
             html = render_to_string(
-                "django_umin/list_content.html", context, self.request
+                "django_umin/delete_row_htmx.html",
+                {"messages": messages.get_messages(self.request)},
+                self.request,
             )
 
             # Return the HTML content with HX-Trigger for messages
@@ -464,13 +882,9 @@ class CRUDDeleteView(DeleteView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context.update(
-            {
-                "crud_view": self.crud_view,
-                "model_name": self.crud_view.model._meta.verbose_name,
-                "url_namespace": self.crud_view.get_url_namespace(),
-            }
-        )
+        context["crud_view"] = self.crud_view
+        context["model_name"] = self.crud_view.verbose_name
+        context["url_namespace"] = self.crud_view.url_namespace
         return context
 
 
@@ -487,37 +901,8 @@ class CRUDIndexView(ListView):
 
     def get_context_data(self, **kwargs):
         # Don't call super() since we're not using the ListView's object_list
-        context = {}
-
-        # Get all registered CRUD views
-        crud_views = self.get_queryset()
-
-        # Organize by app if possible
-        app_models = {}
-        for crud_view in crud_views:
-            model = crud_view.model
-            app_label = model._meta.app_label
-
-            if app_label not in app_models:
-                app_models[app_label] = []
-
-            app_models[app_label].append(
-                {
-                    "name": model._meta.verbose_name_plural,
-                    "model_name": model._meta.model_name,
-                    "app_label": app_label,
-                    "list_url": f"/{model._meta.model_name}/",  # Will be overridden by template
-                    "add_url": f"/{model._meta.model_name}/create/",  # Will be overridden by template
-                    "verbose_name": model._meta.verbose_name,
-                    "list_url_name": f"{model._meta.model_name}_list",
-                    "add_url_name": f"{model._meta.model_name}_create",
-                }
-            )
+        from .urls import registry
 
-        context.update(
-            {
-                "app_models": app_models,
-                "total_models": len(crud_views),
-            }
-        )
-        return context
+        # Organized by app once per registry change, not per request
+        app_models, total_models = registry.build_index()
+        return {"app_models": app_models, "total_models": total_models}
@@ -0,0 +1,27 @@
+// Vite build config shared by every app.
+//
+// `manage.py vite_build` copies this file into the project's config cache and
+// writes the per-app values (base, root, outDir and inputs) to a JSON file
+// whose path is passed in the VITE_UMIN_PARAMS environment variable.
+import { readFileSync } from 'fs';
+import { resolve } from 'path';
+import { defineConfig } from 'vite';
+import tailwindcss from '@tailwindcss/vite';
+
+const params = JSON.parse(readFileSync(process.env.VITE_UMIN_PARAMS, 'utf-8'));
+
+export default defineConfig({
+  base: params.base,
+  root: resolve(params.root),
+  plugins: [
+    tailwindcss(),
+  ],
+  build: {
+    manifest: 'manifest.json',
+    outDir: resolve(params.outDir),
+    rollupOptions: {
+      input: params.inputs,
+    },
+    emptyOutDir: true,
+  },
+});
@@ -3,7 +3,9 @@
 import os
 import sys
 import django
+from io import StringIO
 from pathlib import Path
+from types import SimpleNamespace
 from django.conf import settings as django_settings
 import pytest
 
@@ -18,6 +20,13 @@ def pytest_configure():
             INSTALLED_APPS=[
                 "django.contrib.contenttypes",
                 "django.contrib.auth",
+                "django_umin",
+            ],
+            TEMPLATES=[
+                {
+                    "BACKEND": "django.template.backends.django.DjangoTemplates",
+                    "APP_DIRS": True,
+                }
             ],
             DATABASES={
                 "default": {
@@ -25,6 +34,7 @@ def pytest_configure():
                     "NAME": ":memory:",
                 }
             },
+            ROOT_URLCONF="tests.urls",
             BASE_DIR=Path("/tmp/test_project"),
             STATIC_URL="/static/",
             STATIC_ROOT="/tmp/test_project/staticfiles",
@@ -38,12 +48,145 @@ def pytest_configure():
         django.setup()
 
 
+@pytest.fixture(scope="session")
+def django_db_schema():
+    """Create the tables of the installed apps in the test database, once."""
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0, interactive=False)
+
+
 @pytest.fixture
-def settings():
+def db(django_db_schema):
+    """Run the test in a transaction that is rolled back afterwards."""
+    from django.db import transaction
+
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+class SettingsOverride:
+    """Django settings proxy whose assignments are undone after the test."""
+
+    def __init__(self, monkeypatch):
+        object.__setattr__(self, "_monkeypatch", monkeypatch)
+
+    def __getattr__(self, name):
+        return getattr(django_settings, name)
+
+    def __setattr__(self, name, value):
+        self._monkeypatch.setattr(django_settings, name, value, raising=False)
+
+    def __delattr__(self, name):
+        self._monkeypatch.delattr(django_settings, name, raising=False)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """
+    Provide Django settings that can be modified during tests.
+
+    Assignments go through monkeypatch, so each test starts from the
+    settings configured in pytest_configure and no overrides leak into the
+    next test (or depend on test order).
+    """
+    return SettingsOverride(monkeypatch)
+
+
+# Output buffers shared by every command under test, emptied per test
+_IO_BUFS = (StringIO(), StringIO())
+
+
+@pytest.fixture
+def cmd():
+    """Create a vite_dev Command writing to the shared, emptied buffers."""
+    from django_umin.management.commands.vite_dev import Command
+
+    for buf in _IO_BUFS:
+        buf.seek(0)
+        buf.truncate()
+
+    cmd = Command()
+    cmd.stdout, cmd.stderr = _IO_BUFS
+    return cmd
+
+
+@pytest.fixture(scope="session")
+def fake_app():
     """
-    Provide Django settings object that can be modified during tests.
+    Factory for stand-in AppConfigs with just a name and a path.
 
-    This fixture returns the actual Django settings object, allowing tests
-    to override specific settings as needed.
+    The code under test only reads those two attributes, so a
+    SimpleNamespace avoids building a Mock(spec=AppConfig) per app.
     """
-    return django_settings
+
+    def make(name, path):
+        return SimpleNamespace(name=name, path=str(path))
+
+    return make
+
+
+@pytest.fixture
+def patched_vite_apps(monkeypatch):
+    """
+    Make apps.get_app_config() resolve names from a dict, for this test.
+
+    Call it with {name: app_config}; unknown names raise LookupError like
+    the real app registry.
+    """
+    from django_umin.templatetags import django_umin_vite
+
+    def patch_apps(app_configs):
+        def get_app_config(name):
+            try:
+                return app_configs[name]
+            except KeyError:
+                raise LookupError(f"No installed app with label '{name}'.")
+
+        monkeypatch.setattr(django_umin_vite.apps, "get_app_config", get_app_config)
+
+    return patch_apps
+
+
+@pytest.fixture(autouse=True)
+def clear_vite_caches():
+    """Reset the per-process discovery caches of the Vite commands."""
+    yield
+
+    from django_umin.management import vite_utils
+    from django_umin.management.commands import vite_build, vite_dev
+
+    vite_utils._ASSET_CACHE.clear()
+    vite_utils._NODE_MODULES_FOUND.clear()
+    vite_build._has_fe_dir.cache_clear()
+    vite_dev.Command._fe_cache.clear()
+
+
+@pytest.fixture
+def patched_command_apps(monkeypatch):
+    """
+    Replace the app registry seen by the Vite commands, for this test.
+
+    Call it with a list of app configs; get_app_config() looks them up by
+    name and raises LookupError for unknown names like the real registry.
+    """
+    from django_umin.management.commands import vite_build, vite_dev
+
+    def patch_apps(app_configs):
+        by_name = {app_config.name: app_config for app_config in app_configs}
+
+        def get_app_config(name):
+            try:
+                return by_name[name]
+            except KeyError:
+                raise LookupError(f"No installed app with label '{name}'.")
+
+        fake_apps = SimpleNamespace(
+            get_app_config=get_app_config,
+            get_app_configs=lambda: list(app_configs),
+        )
+        monkeypatch.setattr(vite_build, "apps", fake_apps)
+        monkeypatch.setattr(vite_dev, "apps", fake_apps)
+
+    return patch_apps
@@ -0,0 +1,163 @@
+"""Tests for the bulk actions."""
+
+import csv
+import io
+
+import pytest
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from django_umin.actions import DeleteSelectedAction, ExportCSVAction
+from django_umin.views import CRUDView
+
+
+class UserCRUD(CRUDView):
+    model = User
+    list_display = ["username", "email"]
+
+
+@pytest.fixture
+def users(db):
+    """Create five users, ordered by primary key."""
+    return User.objects.bulk_create(
+        User(username=f"user{i}", email=f"user{i}@example.com") for i in range(5)
+    )
+
+
+def read_csv(response):
+    """Return the pieces streamed by response and the parsed CSV rows."""
+    pieces = [piece.decode() for piece in response.streaming_content]
+    return pieces, list(csv.reader(io.StringIO("".join(pieces))))
+
+
+def test_export_csv_streams_rows_in_chunks(users):
+    """Test that every selected row is streamed, chunk_size rows at a time."""
+
+    class SmallChunkExport(ExportCSVAction):
+        chunk_size = 2
+
+    request = RequestFactory().post("/")
+    response = SmallChunkExport()(UserCRUD(), request, User.objects.order_by("pk"))
+
+    assert isinstance(response, StreamingHttpResponse)
+    assert response["Content-Type"] == "text/csv"
+    assert response["Content-Disposition"] == (
+        'attachment; filename="user_export.csv"'
+    )
+
+    pieces, rows = read_csv(response)
+    # The header, then three chunks of at most two rows
+    assert len(pieces) == 4
+    assert rows[0] == ["username", "email"]
+    assert rows[1:] == [[user.username, user.email] for user in users]
+
+
+@pytest.mark.parametrize(
+    "model, fields, expected",
+    [
+        (User, ("username", "email", "is_staff"), True),
+        (User, ("username", "__str__"), False),
+        (User, ("username", "get_full_name"), False),
+        (User, ("username", "groups"), False),
+        (Permission, ("name", "content_type"), False),
+    ],
+)
+def test_is_column_export(model, fields, expected):
+    """Test that only concrete, non-relational fields count as columns."""
+    assert ExportCSVAction().is_column_export(model, fields) is expected
+
+
+def test_export_csv_reads_plain_columns_with_values_list(users):
+    """Test that a column export selects just the exported columns."""
+    request = RequestFactory().post("/")
+
+    with CaptureQueriesContext(connection) as queries:
+        _, rows = read_csv(ExportCSVAction()(UserCRUD(), request, User.objects.all()))
+
+    assert len(rows) == 6
+    (query,) = queries.captured_queries
+    select = query["sql"].split(" FROM ")[0]
+    assert '"auth_user"."username"' in select
+    assert '"auth_user"."password"' not in select
+
+
+def test_export_csv_falls_back_to_instances(users):
+    """Test that non-column fields are exported from model instances."""
+
+    class UserDisplayCRUD(CRUDView):
+        model = User
+        list_display = ["__str__", "email"]
+
+    request = RequestFactory().post("/")
+    queryset = User.objects.order_by("pk")
+
+    with CaptureQueriesContext(connection) as queries:
+        _, rows = read_csv(ExportCSVAction()(UserDisplayCRUD(), request, queryset))
+
+    (query,) = queries.captured_queries
+    assert '"auth_user"."password"' in query["sql"]
+    assert rows[0] == ["__str__", "email"]
+    assert rows[1:] == [[user.username, user.email] for user in users]
+
+
+def post_request(data, **headers):
+    """Build a POST request that can collect messages."""
+    request = RequestFactory().post("/", data, headers=headers)
+    request._messages = CookieStorage(request)
+    return request
+
+
+def message_texts(request):
+    """Return the texts of the messages added to request."""
+    return [str(message) for message in request._messages]
+
+
+def test_delete_selected_shows_confirmation(users):
+    """Test that the confirmation counts the selection with a single query."""
+    request = post_request({"action": "delete_selected"}, HX_Request="true")
+    queryset = User.objects.filter(pk__in=[user.pk for user in users[:3]])
+
+    with CaptureQueriesContext(connection) as queries:
+        response = DeleteSelectedAction()(UserCRUD(), request, queryset)
+
+    assert len(queries) == 1
+    content = response.content.decode()
+    assert "Delete 3 users?" in content
+    assert content.count('name="_selected_action"') == 3
+    assert User.objects.count() == 5
+
+
+def test_delete_selected_uses_the_collector(users):
+    """Test that the default path cascades and counts only this model's rows."""
+    group = Group.objects.create(name="staff")
+    group.user_set.add(*users[:3])
+    request = post_request({"action": "delete_selected", "confirm": "yes"})
+    queryset = User.objects.filter(pk__in=[user.pk for user in users[:3]])
+
+    assert DeleteSelectedAction()(UserCRUD(), request, queryset) is None
+
+    assert User.objects.count() == 2
+    assert not User.groups.through.objects.exists()
+    assert message_texts(request) == ["Successfully deleted 3 users."]
+
+
+def test_delete_selected_fast_delete(users):
+    """Test that fast_delete removes the rows with one DELETE statement."""
+
+    class FastDeleteAction(DeleteSelectedAction):
+        fast_delete = True
+
+    request = post_request({"action": "delete_selected", "confirm": "yes"})
+    queryset = User.objects.filter(pk__in=[user.pk for user in users[:3]])
+
+    with CaptureQueriesContext(connection) as queries:
+        assert FastDeleteAction()(UserCRUD(), request, queryset) is None
+
+    assert len(queries) == 1
+    assert queries.captured_queries[0]["sql"].startswith("DELETE")
+    assert User.objects.count() == 2
+    assert message_texts(request) == ["Successfully deleted 3 users."]
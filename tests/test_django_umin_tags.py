@@ -0,0 +1,38 @@
+"""Tests for the django_umin_tags template filters."""
+
+import pytest
+from django import forms
+
+from django_umin.templatetags.django_umin_tags import widget_kind
+
+
+class SampleForm(forms.Form):
+    agree = forms.BooleanField()
+    color = forms.ChoiceField(choices=[("r", "Red")])
+    maybe = forms.NullBooleanField()
+    notes = forms.CharField(widget=forms.Textarea)
+    upload = forms.FileField()
+    day = forms.DateField(widget=forms.DateInput)
+    name = forms.CharField()
+
+
+@pytest.mark.parametrize(
+    "field_name, kind",
+    [
+        ("agree", "checkbox"),
+        ("color", "select"),
+        ("maybe", "select"),
+        ("notes", "textarea"),
+        ("upload", "file"),
+        ("day", "date"),
+        ("name", ""),
+    ],
+)
+def test_widget_kind(field_name, kind):
+    """Test that widget_kind classifies bound fields by their widget."""
+    assert widget_kind(SampleForm()[field_name]) == kind
+
+
+def test_widget_kind_accepts_form_field():
+    """Test that widget_kind also accepts an unbound form field."""
+    assert widget_kind(forms.CharField(widget=forms.Textarea)) == "textarea"
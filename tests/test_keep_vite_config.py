@@ -2,176 +2,105 @@
 
 import os
 import tempfile
-from io import StringIO
-from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
 
 import pytest
-from django.apps import AppConfig
 
 
-def test_vite_config_deleted_by_default(tmp_path, settings):
-    """Test that vite config is deleted by default when command stops."""
-    from django_umin.management.commands.vite_dev import Command
-
-    settings.BASE_DIR = str(tmp_path)
-
-    cmd = Command()
-    cmd.stdout = StringIO()
-    cmd.stderr = StringIO()
-
-    # Create node_modules
-    (tmp_path / "node_modules").mkdir()
-
-    # Mock app config
-    mock_app = Mock(spec=AppConfig)
-    mock_app.name = "testapp"
-    mock_app.path = str(tmp_path / "testapp")
+@pytest.fixture(scope="session")
+def vite_project(tmp_path_factory):
+    """Create a project with node_modules and apps with fe/ assets, once."""
+    root = tmp_path_factory.mktemp("vite_project")
+    (root / "node_modules").mkdir()
+    for app_name in ("testapp", "testapp1", "testapp2"):
+        css_dir = root / app_name / "fe" / "css"
+        css_dir.mkdir(parents=True)
+        (css_dir / "app.css").write_text("/* test */")
+    return root
 
-    # Create fe directory
-    fe_dir = tmp_path / "testapp" / "fe"
-    fe_dir.mkdir(parents=True)
-    (fe_dir / "css").mkdir()
-    (fe_dir / "css" / "app.css").write_text("/* test */")
 
-    temp_config_path = None
+@pytest.fixture
+def project_root(vite_project, settings):
+    """Point BASE_DIR at the shared Vite project."""
+    settings.BASE_DIR = str(vite_project)
+    return vite_project
 
-    with patch("django_umin.management.commands.vite_dev.apps") as mock_apps:
-        mock_apps.get_app_configs.return_value = [mock_app]
 
-        with patch("subprocess.run") as mock_run:
-            # Simulate KeyboardInterrupt
-            mock_run.side_effect = KeyboardInterrupt()
+@pytest.fixture
+def temp_configs(cmd):
+    """Record the paths of the temp config files created by the command."""
+    paths = []
 
-            # Capture the temp config file path
-            original_tempfile = tempfile.NamedTemporaryFile
-
-            def capture_tempfile(*args, **kwargs):
-                nonlocal temp_config_path
-                f = original_tempfile(*args, **kwargs)
-                temp_config_path = f.name
-                return f
-
-            with patch("tempfile.NamedTemporaryFile", side_effect=capture_tempfile):
-                cmd.handle(app_names=None, keep_vite_config=False)
-
-    # Verify config was deleted
-    assert temp_config_path is not None
-    assert not os.path.exists(temp_config_path)
-    assert "Cleaned up temporary config file" in cmd.stdout.getvalue()
+    def capture_mkstemp(*args, **kwargs):
+        fd, path = tempfile.mkstemp(*args, **kwargs)
+        paths.append(path)
+        return fd, path
 
+    cmd._mkstemp = capture_mkstemp
+    yield paths
 
-def test_vite_config_kept_with_flag(tmp_path, settings):
-    """Test that vite config is preserved when --keep-vite-config is used."""
-    from django_umin.management.commands.vite_dev import Command
+    # Remove configs kept by the command, the project is shared
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
 
-    settings.BASE_DIR = str(tmp_path)
 
-    cmd = Command()
-    cmd.stdout = StringIO()
-    cmd.stderr = StringIO()
+@pytest.fixture
+def run_vite_dev(cmd, patched_command_apps):
+    """Run the command until the (fake) Vite process is interrupted."""
 
-    # Create node_modules
-    (tmp_path / "node_modules").mkdir()
+    def interrupt(*args, **kwargs):
+        raise KeyboardInterrupt()
 
-    # Mock app config
-    mock_app = Mock(spec=AppConfig)
-    mock_app.name = "testapp"
-    mock_app.path = str(tmp_path / "testapp")
+    cmd._runner = interrupt
 
-    # Create fe directory
-    fe_dir = tmp_path / "testapp" / "fe"
-    fe_dir.mkdir(parents=True)
-    (fe_dir / "css").mkdir()
-    (fe_dir / "css" / "app.css").write_text("/* test */")
+    def run(app_configs, keep_vite_config):
+        patched_command_apps(app_configs)
+        cmd.handle(app_names=None, keep_vite_config=keep_vite_config)
 
-    temp_config_path = None
+    return run
 
-    with patch("django_umin.management.commands.vite_dev.apps") as mock_apps:
-        mock_apps.get_app_configs.return_value = [mock_app]
 
-        with patch("subprocess.run") as mock_run:
-            # Simulate KeyboardInterrupt
-            mock_run.side_effect = KeyboardInterrupt()
+def test_vite_config_deleted_by_default(
+    project_root, cmd, temp_configs, run_vite_dev, fake_app
+):
+    """Test that vite config is deleted by default when command stops."""
+    run_vite_dev([fake_app("testapp", project_root / "testapp")], False)
 
-            # Capture the temp config file path
-            original_tempfile = tempfile.NamedTemporaryFile
+    # Verify config was deleted
+    assert len(temp_configs) == 1
+    assert not os.path.exists(temp_configs[0])
+    assert "Cleaned up temporary config file" in cmd.stdout.getvalue()
 
-            def capture_tempfile(*args, **kwargs):
-                nonlocal temp_config_path
-                f = original_tempfile(*args, **kwargs)
-                temp_config_path = f.name
-                return f
 
-            with patch("tempfile.NamedTemporaryFile", side_effect=capture_tempfile):
-                cmd.handle(app_names=None, keep_vite_config=True)
+def test_vite_config_kept_with_flag(
+    project_root, cmd, temp_configs, run_vite_dev, fake_app
+):
+    """Test that vite config is preserved when --keep-vite-config is used."""
+    run_vite_dev([fake_app("testapp", project_root / "testapp")], True)
 
     # Verify config still exists
-    assert temp_config_path is not None
-    assert os.path.exists(temp_config_path)
+    assert len(temp_configs) == 1
+    assert os.path.exists(temp_configs[0])
     assert "Vite config preserved at:" in cmd.stdout.getvalue()
 
-    # Clean up
-    os.remove(temp_config_path)
-
 
-def test_vite_config_content_valid(tmp_path, settings):
+def test_vite_config_content_valid(
+    project_root, cmd, temp_configs, run_vite_dev, settings, fake_app
+):
     """Test that the preserved config file contains valid Vite configuration."""
-    from django_umin.management.commands.vite_dev import Command
-
-    settings.BASE_DIR = str(tmp_path)
     settings.DJANGO_UMIN_VITE_DEV_SERVER_PORT = 5173
 
-    cmd = Command()
-    cmd.stdout = StringIO()
-    cmd.stderr = StringIO()
-
-    # Create node_modules
-    (tmp_path / "node_modules").mkdir()
-
-    # Mock app configs
-    apps_data = [
-        ("testapp1", tmp_path / "testapp1"),
-        ("testapp2", tmp_path / "testapp2"),
+    app_configs = [
+        fake_app("testapp1", project_root / "testapp1"),
+        fake_app("testapp2", project_root / "testapp2"),
     ]
-
-    mock_app_configs = []
-    for app_name, app_path in apps_data:
-        mock_app = Mock(spec=AppConfig)
-        mock_app.name = app_name
-        mock_app.path = str(app_path)
-        mock_app_configs.append(mock_app)
-
-        # Create fe directory
-        fe_dir = app_path / "fe"
-        fe_dir.mkdir(parents=True)
-        (fe_dir / "css").mkdir()
-        (fe_dir / "css" / "app.css").write_text("/* test */")
-
-    temp_config_path = None
-
-    with patch("django_umin.management.commands.vite_dev.apps") as mock_apps:
-        mock_apps.get_app_configs.return_value = mock_app_configs
-
-        with patch("subprocess.run") as mock_run:
-            mock_run.side_effect = KeyboardInterrupt()
-
-            original_tempfile = tempfile.NamedTemporaryFile
-
-            def capture_tempfile(*args, **kwargs):
-                nonlocal temp_config_path
-                f = original_tempfile(*args, **kwargs)
-                temp_config_path = f.name
-                return f
-
-            with patch("tempfile.NamedTemporaryFile", side_effect=capture_tempfile):
-                cmd.handle(app_names=None, keep_vite_config=True)
+    run_vite_dev(app_configs, True)
 
     # Verify config exists and has expected content
-    assert temp_config_path is not None
-    assert os.path.exists(temp_config_path)
+    assert len(temp_configs) == 1
+    assert os.path.exists(temp_configs[0])
 
-    with open(temp_config_path, "r") as f:
+    with open(temp_configs[0], "r") as f:
         config_content = f.read()
 
     # Verify key elements
@@ -182,41 +111,12 @@ def test_vite_config_content_valid(tmp_path, settings):
     assert "port: 5173" in config_content
     assert "base: '/static/'" in config_content
 
-    # Clean up
-    os.remove(temp_config_path)
 
-
-def test_vite_config_path_shown_in_output(tmp_path, settings):
+def test_vite_config_path_shown_in_output(
+    project_root, cmd, temp_configs, run_vite_dev, fake_app
+):
     """Test that the temp config path is shown in command output."""
-    from django_umin.management.commands.vite_dev import Command
-
-    settings.BASE_DIR = str(tmp_path)
-
-    cmd = Command()
-    cmd.stdout = StringIO()
-    cmd.stderr = StringIO()
-
-    # Create node_modules
-    (tmp_path / "node_modules").mkdir()
-
-    # Mock app config
-    mock_app = Mock(spec=AppConfig)
-    mock_app.name = "testapp"
-    mock_app.path = str(tmp_path / "testapp")
-
-    # Create fe directory
-    fe_dir = tmp_path / "testapp" / "fe"
-    fe_dir.mkdir(parents=True)
-    (fe_dir / "css").mkdir()
-    (fe_dir / "css" / "app.css").write_text("/* test */")
-
-    with patch("django_umin.management.commands.vite_dev.apps") as mock_apps:
-        mock_apps.get_app_configs.return_value = [mock_app]
-
-        with patch("subprocess.run") as mock_run:
-            mock_run.side_effect = KeyboardInterrupt()
-
-            cmd.handle(app_names=None, keep_vite_config=True)
+    run_vite_dev([fake_app("testapp", project_root / "testapp")], True)
 
     output = cmd.stdout.getvalue()
 
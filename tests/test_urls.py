@@ -0,0 +1,46 @@
+"""Tests for the CRUD registry."""
+
+import pytest
+from django.contrib.auth.models import Group, User
+
+from django_umin.urls import CRUDRegistry
+from django_umin.views import CRUDView
+
+
+class UserCRUD(CRUDView):
+    model = User
+
+
+class GroupCRUD(CRUDView):
+    model = Group
+
+
+@pytest.fixture
+def crud_registry():
+    """Create an empty registry, separate from the global one."""
+    return CRUDRegistry()
+
+
+def test_build_index_groups_models_by_app(crud_registry):
+    """Test that the index lists each registered model under its app."""
+    crud_registry.register(UserCRUD)
+    crud_registry.register(GroupCRUD)
+
+    app_models, total_models = crud_registry.build_index()
+
+    assert total_models == 2
+    assert [entry["model_name"] for entry in app_models["auth"]] == ["user", "group"]
+    assert app_models["auth"][0]["list_url_name"] == "user_list"
+
+
+def test_build_index_is_cached_until_register(crud_registry):
+    """Test that the index is reused and rebuilt after a new registration."""
+    crud_registry.register(UserCRUD)
+    index = crud_registry.build_index()
+
+    assert crud_registry.build_index() is index
+
+    crud_registry.register(GroupCRUD)
+
+    assert crud_registry.build_index() is not index
+    assert crud_registry.build_index()[1] == 2
@@ -0,0 +1,424 @@
+"""Tests for CRUDView queryset construction."""
+
+import re
+from functools import partialmethod
+
+import pytest
+from django.contrib.auth.models import Permission, User
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.db import connection
+from django.db.models import Q
+from django.http import Http404, QueryDict
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils.html import escape
+
+from django_umin.views import (
+    CountFreePaginator,
+    CRUDDeleteView,
+    CRUDListView,
+    CRUDView,
+    _editable_field_names,
+)
+
+
+@pytest.fixture
+def keyset_view():
+    """Create a CRUDView for User using keyset pagination."""
+
+    class UserCRUD(CRUDView):
+        model = User
+        ordering = ["-email", "username"]
+        pagination_style = "keyset"
+
+    return UserCRUD()
+
+
+def test_keyset_ordering_appends_pk(keyset_view):
+    """Test that the primary key is added as a tie-breaker."""
+    assert keyset_view._keyset_ordering == ("-email", "username", "pk")
+
+
+def test_keyset_falls_back_to_offset_without_ordering():
+    """Test that keyset pagination is disabled when no ordering is set."""
+
+    class UserCRUD(CRUDView):
+        model = User
+        pagination_style = "keyset"
+
+    assert UserCRUD()._keyset_ordering is None
+
+
+def test_cursor_round_trip_filters_after_last_row(keyset_view):
+    """Test that a cursor seeks past the row it was built from."""
+    user = User(pk=7, username="bob", email="bob@example.com")
+    cursor = keyset_view.encode_cursor(user)
+
+    queryset = keyset_view.apply_cursor(User.objects.all(), cursor)
+    where = str(queryset.query).split("WHERE", 1)[1]
+
+    assert '"auth_user"."email" < bob@example.com' in where
+    assert '"auth_user"."username" > bob' in where
+    assert '"auth_user"."id" > 7' in where
+
+
+def test_keyset_falls_back_to_offset_without_paginate_by():
+    """Test that an unpaginated list does not use keyset pagination."""
+
+    class UserCRUD(CRUDView):
+        model = User
+        ordering = ["username"]
+        pagination_style = "keyset"
+        paginate_by = None
+
+    assert UserCRUD()._keyset_ordering is None
+
+
+def test_keyset_rejects_nullable_ordering():
+    """Test that a column that can be NULL cannot be a keyset ordering key."""
+
+    class UserCRUD(CRUDView):
+        model = User
+        ordering = ["-last_login"]
+        pagination_style = "keyset"
+
+    with pytest.raises(ValueError, match="'last_login' can be NULL"):
+        UserCRUD()
+
+
+def test_keyset_selects_ordering_relations(db):
+    """Test that cursors over related columns need no query per page."""
+
+    class PermissionCRUD(CRUDView):
+        model = Permission
+        list_display = ["name"]
+        ordering = ["content_type__app_label", "codename"]
+        pagination_style = "keyset"
+
+    crud = PermissionCRUD()
+    assert "content_type" in crud.list_select_related
+
+    permission = crud.get_queryset(RequestFactory().get("/")).first()
+    with CaptureQueriesContext(connection) as queries:
+        cursor = crud.encode_cursor(permission)
+
+    assert len(queries) == 0
+    assert crud.apply_cursor(Permission.objects.all(), cursor).count() == (
+        Permission.objects.filter(
+            Q(content_type__app_label__gt=permission.content_type.app_label)
+            | Q(
+                content_type__app_label=permission.content_type.app_label,
+                codename__gt=permission.codename,
+            )
+        ).count()
+    )
+
+
+def test_keyset_list_view_pages_with_cursors(db):
+    """Test that the list view renders a next link that resumes the listing."""
+
+    class PermissionCRUD(CRUDView):
+        model = Permission
+        list_display = ["codename"]
+        ordering = ["content_type__app_label", "codename"]
+        pagination_style = "keyset"
+        paginate_by = 10
+
+    view = CRUDListView.as_view(crud_view=PermissionCRUD())
+    expected = list(
+        Permission.objects.order_by("content_type__app_label", "codename", "pk")
+        .values_list("codename", flat=True)[:20]
+    )
+    factory = RequestFactory(headers={"HX-Request": "true"})
+
+    first = view(factory.get("/")).render()
+    cursor = first.context_data["next_cursor"]
+    second = view(factory.get("/", {"cursor": cursor})).render()
+
+    assert f"?cursor={cursor}" in first.content.decode()
+    assert [p.codename for p in first.context_data["object_list"]] == expected[:10]
+    assert [p.codename for p in second.context_data["object_list"]] == expected[10:]
+
+
+def test_keyset_links_keep_the_search_and_filter_params(db):
+    """Test that First/Next links only replace the cursor in the query string."""
+
+    class PermissionCRUD(CRUDView):
+        model = Permission
+        list_display = ["codename"]
+        list_filter = ["content_type__app_label"]
+        ordering = ["codename"]
+        pagination_style = "keyset"
+        paginate_by = 2
+
+    view = CRUDListView.as_view(crud_view=PermissionCRUD())
+    factory = RequestFactory(headers={"HX-Request": "true"})
+    params = {"content_type__app_label": "auth", "q": "add & view"}
+
+    first = view(factory.get("/", params)).render()
+    next_query = QueryDict(first.context_data["next_page_query"])
+    second = view(factory.get("/", next_query)).render()
+
+    assert next_query.dict() == {**params, "cursor": first.context_data["next_cursor"]}
+    assert f'href="?{escape(first.context_data["next_page_query"])}"' in (
+        first.content.decode()
+    )
+    assert QueryDict(second.context_data["first_page_query"]).dict() == params
+    assert f'href="?{escape(second.context_data["first_page_query"])}"' in (
+        second.content.decode()
+    )
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "W10=", "eyJhIjogMX0="])
+def test_invalid_cursor_raises_404(keyset_view, cursor):
+    """Test that malformed cursors are rejected with Http404."""
+    with pytest.raises(Http404):
+        keyset_view.apply_cursor(User.objects.all(), cursor)
+
+
+def test_get_form_class_is_built_once():
+    """Test that the generated model form class is reused across calls."""
+
+    class UserCRUD(CRUDView):
+        model = User
+        fields = ["username", "email"]
+
+    crud = UserCRUD()
+    form_class = crud.get_form_class()
+
+    assert crud.get_form_class() is form_class
+    assert list(form_class.base_fields) == ["username", "email"]
+
+
+def test_fulltext_search_annotates_search_vector():
+    """Test that fulltext mode searches a SearchVector over search_fields."""
+
+    class UserCRUD(CRUDView):
+        model = User
+        search_fields = ["username", "email"]
+        search_mode = "fulltext"
+
+    queryset = UserCRUD().fulltext_search(User.objects.all(), "bob")
+
+    assert "_search_vector" in queryset.query.annotations
+    assert queryset.query.where
+
+
+def test_list_queryset_loads_only_displayed_columns():
+    """Test that the list queryset defers columns not in list_display."""
+
+    class UserCRUD(CRUDView):
+        model = User
+        list_display = ["username", "email"]
+
+    crud = UserCRUD()
+    sql = str(crud.get_queryset(RequestFactory().get("/")).query)
+
+    assert crud._only_fields == ["pk", "username", "email"]
+    assert '"auth_user"."password"' not in sql
+
+
+@pytest.mark.parametrize(
+    "list_display, defer_enabled",
+    [
+        (["username", "__str__"], True),
+        (["username", "get_full_name"], True),
+        (["username", "email"], False),
+    ],
+)
+def test_list_queryset_loads_all_columns(list_display, defer_enabled):
+    """Test that columns are not deferred for non-field entries or opt-out."""
+
+    class UserCRUD(CRUDView):
+        model = User
+
+    UserCRUD.list_display = list_display
+    UserCRUD.defer_enabled = defer_enabled
+
+    assert UserCRUD()._only_fields is None
+
+
+@pytest.mark.parametrize(
+    "list_display, values_mode",
+    [
+        (["username", "is_staff"], True),
+        (["username", "__str__"], False),
+        (["username", "groups"], False),
+    ],
+)
+def test_values_mode_requires_plain_columns(list_display, values_mode):
+    """Test that values() rows are only used when every column is a field."""
+
+    class UserCRUD(CRUDView):
+        model = User
+
+    UserCRUD.list_display = list_display
+    UserCRUD.values_mode = True
+
+    assert UserCRUD()._values_mode is values_mode
+
+
+def test_values_mode_accessors_read_row_dicts():
+    """Test that accessors index values() dicts in values mode."""
+
+    class UserCRUD(CRUDView):
+        model = User
+        list_display = ["username", "is_staff"]
+        values_mode = True
+
+    accessors = dict(UserCRUD().build_field_accessors())
+    row = {"pk": 1, "username": "bob", "is_staff": True}
+
+    assert accessors["username"](row) == "bob"
+    assert accessors["is_staff"](row) == "✓"
+
+
+def test_count_free_paginator_probes_next_page():
+    """Test that pages detect a next page without counting rows."""
+    paginator = CountFreePaginator(list(range(7)), 3)
+
+    page = paginator.page(2)
+    assert list(page) == [3, 4, 5]
+    assert page.has_next() and page.has_previous()
+    assert (page.start_index(), page.end_index()) == (4, 6)
+
+    last = paginator.page(3)
+    assert list(last) == [6]
+    assert not last.has_next()
+    assert last.end_index() == 7
+
+
+@pytest.mark.parametrize(
+    "number, error", [(4, EmptyPage), (0, EmptyPage), ("x", PageNotAnInteger)]
+)
+def test_count_free_paginator_rejects_invalid_pages(number, error):
+    """Test that out-of-range and non-integer pages are rejected."""
+    with pytest.raises(error):
+        CountFreePaginator(list(range(7)), 3).page(number)
+
+
+def test_default_fields_are_shared_per_model():
+    """Test that model introspection for defaults is reused across views."""
+
+    class FirstUserCRUD(CRUDView):
+        model = User
+
+    class SecondUserCRUD(CRUDView):
+        model = User
+
+    first, second = FirstUserCRUD(), SecondUserCRUD()
+
+    assert first.list_display == second.list_display == ["email"]
+    assert _editable_field_names(User) is _editable_field_names(User)
+    assert "password" in first._default_fields
+
+
+def test_bare_relation_loads_the_whole_related_row(db):
+    """Test that displaying a relation keeps str() of it free of queries."""
+
+    class PermissionCRUD(CRUDView):
+        model = Permission
+        list_display = ["name", "content_type", "content_type__app_label"]
+
+    crud = PermissionCRUD()
+    queryset = crud.get_queryset(RequestFactory().get("/"))[:5]
+
+    with CaptureQueriesContext(connection) as queries:
+        rows = [(obj.name, str(obj.content_type)) for obj in queryset]
+
+    assert len(rows) == 5
+    assert len(queries) == 1
+    assert crud._only_fields == ["pk", "name", "content_type"]
+
+
+def test_select_related_relation_is_not_deferred(db):
+    """Test that list_select_related outside list_display keeps its key."""
+
+    class PermissionCRUD(CRUDView):
+        model = Permission
+        list_display = ["name"]
+        list_select_related = ["content_type"]
+
+    queryset = PermissionCRUD().get_queryset(RequestFactory().get("/"))[:5]
+
+    with CaptureQueriesContext(connection) as queries:
+        rows = [str(obj.content_type) for obj in queryset]
+
+    assert len(rows) == 5
+    assert len(queries) == 1
+
+
+def test_prefetched_foreign_key_is_not_deferred(db):
+    """Test that prefetching a foreign key runs one query, not one per row."""
+
+    class PermissionCRUD(CRUDView):
+        model = Permission
+        list_display = ["name"]
+        list_prefetch_related = ["content_type"]
+
+    queryset = PermissionCRUD().get_queryset(RequestFactory().get("/"))[:5]
+
+    with CaptureQueriesContext(connection) as queries:
+        rows = [str(obj.content_type) for obj in queryset]
+
+    assert len(rows) == 5
+    assert len(queries) == 2
+
+
+def test_htmx_delete_removes_the_row_and_swaps_the_message(db):
+    """Test that an HTMX delete answers with just the out-of-band message."""
+
+    class UserCRUD(CRUDView):
+        model = User
+
+    user = User.objects.create(username="bob", email="bob@example.com")
+    request = RequestFactory().post("/", headers={"HX-Request": "true"})
+    request._messages = CookieStorage(request)
+
+    response = CRUDDeleteView.as_view(crud_view=UserCRUD())(request, pk=user.pk)
+    html = response.content.decode()
+
+    assert response.status_code == 200
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert 'hx-swap-oob="innerHTML:#list-messages"' in html
+    assert "bob was deleted successfully." in html
+    assert "<tr" not in html
+
+
+def test_list_page_renders_accessor_values(db, monkeypatch):
+    """Test how booleans, None, choices and callables show in list cells."""
+    first_name = User._meta.get_field("first_name")
+    monkeypatch.setattr(first_name, "choices", [("bob", "Bobby")])
+    monkeypatch.setattr(
+        User,
+        "get_first_name_display",
+        partialmethod(User._get_FIELD_display, field=first_name),
+        raising=False,
+    )
+
+    class UserCRUD(CRUDView):
+        model = User
+        list_display = [
+            "username",
+            "is_active",
+            "is_staff",
+            "last_login",
+            "first_name",
+            "get_full_name",
+        ]
+        ordering = ["username"]
+
+    user = User.objects.create(username="bob", first_name="bob", last_name="Smith")
+    request = RequestFactory().get("/", headers={"HX-Request": "true"})
+    response = CRUDListView.as_view(crud_view=UserCRUD())(request).render()
+
+    row = re.search(
+        rf'<tr id="row-{user.pk}".*?</tr>', response.content.decode(), re.S
+    ).group()
+    cells = [
+        re.sub(r"<[^>]+>", "", cell).strip()
+        for cell in re.findall(r"<td[^>]*>(.*?)</td>", row, re.S)
+    ]
+
+    assert cells[:-1] == ["bob", "✓", "✗", "-", "Bobby", "bob Smith"]
@@ -0,0 +1,301 @@
+"""Tests for the vite_build management command."""
+
+import json
+import os
+import time
+from io import StringIO
+from unittest.mock import Mock
+
+import pytest
+from django.core.management import CommandError
+
+from django_umin.management.commands import vite_build
+from django_umin.management.commands.vite_build import build_all
+
+
+@pytest.fixture
+def project(tmp_path, settings, fake_app, patched_command_apps):
+    """Create a project with node_modules and two apps with fe/ assets."""
+    (tmp_path / "node_modules").mkdir()
+
+    app_configs = []
+    for app_name in ("app1", "app2"):
+        css_dir = tmp_path / app_name / "fe" / "css"
+        css_dir.mkdir(parents=True)
+        (css_dir / "app.css").write_text("/* CSS */")
+        app_configs.append(fake_app(app_name, tmp_path / app_name))
+
+    settings.BASE_DIR = str(tmp_path)
+    patched_command_apps(app_configs)
+    return tmp_path
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    """Stub out the Vite processes; returns the Mock standing in for them."""
+    runner = Mock(return_value=0)
+    monkeypatch.setattr(
+        vite_build.Command,
+        "run_streaming",
+        lambda self, *args, **kwargs: runner(*args, **kwargs),
+    )
+    return runner
+
+
+def test_build_all_runs_in_process(project, runner):
+    """Test that build_all() builds every app with the given streams."""
+    stdout = StringIO()
+
+    build_all(stdout, StringIO())
+
+    assert runner.call_count == 2
+    assert {call.kwargs["prefix"] for call in runner.call_args_list} == {
+        "[app1] ",
+        "[app2] ",
+    }
+    assert "Vite assets build process completed." in stdout.getvalue()
+
+
+def test_parallel_build_runs_every_app(project, runner):
+    """Test that each app gets its own `vite build` with its own params."""
+    build_all(StringIO(), StringIO())
+
+    params_files = set()
+    for call in runner.call_args_list:
+        command, project_root = call.args
+        assert command[-4:-1] == ["vite", "build", "--config"]
+        assert project_root == str(project)
+        params_files.add(call.kwargs["env"]["VITE_UMIN_PARAMS"])
+
+    assert len(params_files) == 2
+
+
+@pytest.mark.parametrize("jobs, max_workers", [(1, 1), (8, 2), (None, None)])
+def test_jobs_caps_the_worker_pool(project, runner, monkeypatch, jobs, max_workers):
+    """Test that --jobs limits the pool, which never exceeds the app count."""
+    pool_sizes = []
+    executor = vite_build.ThreadPoolExecutor
+
+    def record_pool(max_workers):
+        pool_sizes.append(max_workers)
+        return executor(max_workers=max_workers)
+
+    monkeypatch.setattr(vite_build, "ThreadPoolExecutor", record_pool)
+    monkeypatch.setattr(vite_build.os, "cpu_count", lambda: 4)
+
+    build_all(StringIO(), StringIO(), jobs=jobs)
+
+    assert pool_sizes == [max_workers or 2]
+    assert runner.call_count == 2
+
+
+def test_failed_app_build_raises_command_error(project, runner):
+    """Test that a failing app is reported after the other builds finish."""
+    runner.side_effect = lambda command, project_root, prefix, env: int(
+        prefix == "[app2] "
+    )
+    stderr = StringIO()
+
+    with pytest.raises(CommandError, match="Failed to build assets for: app2"):
+        build_all(StringIO(), stderr)
+
+    assert runner.call_count == 2
+    assert "Failed to build assets for app2." in stderr.getvalue()
+
+
+def test_batch_build_runs_one_node_process(project, runner):
+    """Test that --batch writes a runner script building every app."""
+    build_all(StringIO(), StringIO(), batch=True)
+
+    runner.assert_called_once()
+    (command, project_root), _ = runner.call_args
+    assert command[0] == "node"
+    assert project_root == str(project)
+
+    script_path = command[1]
+    assert script_path.startswith(str(project / ".vite-umin-cache" / "batch-"))
+    with open(script_path) as f:
+        script = f.read()
+
+    assert "import { build } from 'vite';" in script
+    assert 'const configFile = "' + str(project / ".vite-umin-cache") in script
+    for app_name in ("app1", "app2"):
+        assert f'["{app_name}", "{project / ".vite-umin-cache"}' in script
+        assert f"vite-umin.params-{app_name}-" in script
+
+
+def test_batch_build_failure_raises_command_error(project, runner):
+    """Test that a non-zero exit of the batch Node process is an error."""
+    runner.return_value = 1
+
+    with pytest.raises(CommandError, match="one or more apps"):
+        build_all(StringIO(), StringIO(), batch=True)
+
+
+def set_mtime(path, mtime_ns):
+    """Set both timestamps of path to mtime_ns."""
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def built_at(project, runner):
+    """
+    Build both apps once and give them manifests newer than any source.
+
+    Returns the manifests' mtime in nanoseconds.
+    """
+    build_all(StringIO(), StringIO())
+    runner.reset_mock()
+
+    built_at = time.time_ns() + 10_000_000_000
+    for app_name in ("app1", "app2"):
+        manifest = project / app_name / "static" / app_name / "dist" / "manifest.json"
+        manifest.parent.mkdir(parents=True)
+        manifest.write_text("{}")
+        set_mtime(manifest, built_at)
+    return built_at
+
+
+def built_apps(runner):
+    """Return the names of the apps the runner was asked to build."""
+    return sorted(call.kwargs["prefix"][1:-2] for call in runner.call_args_list)
+
+
+def test_up_to_date_apps_are_skipped(project, built_at, runner):
+    """Test that apps whose manifest is newer than every source are skipped."""
+    stdout = StringIO()
+
+    build_all(stdout, StringIO())
+
+    runner.assert_not_called()
+    assert "Assets for app1 are up-to-date, skipping." in stdout.getvalue()
+    assert "Assets for app2 are up-to-date, skipping." in stdout.getvalue()
+
+
+def test_touched_source_is_rebuilt(project, built_at, runner):
+    """Test that a source modified after the build triggers a rebuild."""
+    source = project / "app1" / "fe" / "css" / "app.css"
+    set_mtime(source, built_at + 1_000_000_000)
+
+    build_all(StringIO(), StringIO())
+
+    assert built_apps(runner) == ["app1"]
+
+
+def test_newer_params_file_is_rebuilt(project, built_at, runner):
+    """Test that params newer than the manifest trigger a rebuild."""
+    cache_dir = project / ".vite-umin-cache"
+    (params_file,) = cache_dir.glob("vite-umin.params-app2-*.json")
+    set_mtime(params_file, built_at + 1_000_000_000)
+
+    build_all(StringIO(), StringIO())
+
+    assert built_apps(runner) == ["app2"]
+
+
+@pytest.fixture
+def extra_css(project):
+    """Give app1 a second stylesheet; returns its path."""
+    extra_css = project / "app1" / "fe" / "css" / "extra.css"
+    extra_css.write_text("/* CSS */")
+    return extra_css
+
+
+def test_deleted_source_is_rebuilt(project, extra_css, built_at, runner):
+    """Test that removing a source, which only touches its directory, rebuilds."""
+    extra_css.unlink()
+    set_mtime(extra_css.parent, built_at + 1_000_000_000)
+
+    build_all(StringIO(), StringIO())
+
+    assert built_apps(runner) == ["app1"]
+
+
+def test_edited_config_shim_is_rebuilt(project, built_at, runner, monkeypatch):
+    """Test that a Vite config shim newer than the manifests rebuilds every app."""
+    shim = project / "vite-umin.config.js"
+    shim.write_text("export default {};")
+    set_mtime(shim, built_at + 1_000_000_000)
+    monkeypatch.setattr(vite_build, "VITE_CONFIG_SHIM", str(shim))
+
+    build_all(StringIO(), StringIO())
+
+    assert built_apps(runner) == ["app1", "app2"]
+
+
+def test_force_rebuilds_up_to_date_apps(project, built_at, runner):
+    """Test that --force rebuilds apps even when their manifest is current."""
+    build_all(StringIO(), StringIO(), force=True)
+
+    assert built_apps(runner) == ["app1", "app2"]
+
+
+def params_by_app(runner):
+    """Map each built app to the params file passed in VITE_UMIN_PARAMS."""
+    return {
+        call.kwargs["prefix"][1:-2]: call.kwargs["env"]["VITE_UMIN_PARAMS"]
+        for call in runner.call_args_list
+    }
+
+
+def test_params_file_is_written_and_passed_in_env(project, runner):
+    """Test that each app's JSON params reach Vite through the environment."""
+    build_all(StringIO(), StringIO())
+
+    params_file = params_by_app(runner)["app1"]
+    assert os.path.dirname(params_file) == str(project / ".vite-umin-cache")
+    with open(params_file) as f:
+        params = json.load(f)
+    assert params["outDir"] == os.path.join("app1", "static", "app1", "dist")
+    assert params["inputs"] == {
+        "app-css": os.path.join("app1", "fe", "css", "app.css")
+    }
+
+    # Vite is pointed at the copy of the static config shim
+    config_file = runner.call_args.args[0][-1]
+    with open(config_file) as f, open(vite_build.VITE_CONFIG_SHIM) as shim:
+        assert f.read() == shim.read()
+
+
+def test_params_file_is_reused_while_unchanged(project, runner):
+    """Test that unchanged params reuse the existing file, not rewrite it."""
+    build_all(StringIO(), StringIO())
+    first = params_by_app(runner)
+    mtime = os.stat(first["app1"]).st_mtime_ns
+    runner.reset_mock()
+
+    build_all(StringIO(), StringIO(), force=True)
+
+    assert params_by_app(runner) == first
+    assert os.stat(first["app1"]).st_mtime_ns == mtime
+
+
+def test_changed_params_get_a_new_file(project, runner):
+    """Test that new assets produce a params file with a different name."""
+    build_all(StringIO(), StringIO())
+    first = params_by_app(runner)["app1"]
+    runner.reset_mock()
+
+    (project / "app1" / "fe" / "css" / "extra.css").write_text("/* Extra */")
+    build_all(StringIO(), StringIO(), force=True)
+
+    second = params_by_app(runner)["app1"]
+    assert second != first
+    with open(second) as f:
+        assert "extra-css" in json.load(f)["inputs"]
+
+
+def test_clean_removes_the_config_cache(project, runner):
+    """Test that --clean removes stale files from .vite-umin-cache/."""
+    cache_dir = project / ".vite-umin-cache"
+    cache_dir.mkdir()
+    stale = cache_dir / "vite-umin.params-gone-0123456789ab.json"
+    stale.write_text("{}")
+    stdout = StringIO()
+
+    build_all(stdout, StringIO(), clean=True)
+
+    assert not stale.exists()
+    assert f"Removed cached Vite configs in {cache_dir}" in stdout.getvalue()
+    # The cache is recreated for this build
+    assert len(list(cache_dir.glob("vite-umin.params-*.json"))) == 2
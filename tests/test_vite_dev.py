@@ -1,32 +1,27 @@
 """Tests for the vite_dev management command."""
 
 import os
-import tempfile
+import shutil
 from io import StringIO
 from pathlib import Path
-from unittest.mock import Mock, patch, call
+from unittest.mock import Mock
 
 import pytest
-from django.apps import AppConfig
-from django.core.management import call_command
 from django.test import override_settings
 
+from django_umin.management.commands.vite_dev import Command, dev_serve, vite_command
 
-@pytest.fixture
-def mock_app_config():
-    """Create a mock app config with a fe directory."""
-    app_config = Mock(spec=AppConfig)
-    app_config.name = "testapp"
-    app_config.path = "/fake/path/testapp"
-    return app_config
 
+@pytest.fixture(scope="session")
+def temp_project_root(tmp_path_factory):
+    """
+    Create a temporary project structure with multiple apps, once.
 
-@pytest.fixture
-def temp_project_root(tmp_path):
-    """Create a temporary project structure with multiple apps."""
+    The tree is shared by every test in the session, so tests must not
+    modify it; use writable_project_root for that.
+    """
     # Create project structure
-    project_root = tmp_path / "project"
-    project_root.mkdir()
+    project_root = tmp_path_factory.mktemp("project")
 
     # Create node_modules
     (project_root / "node_modules").mkdir()
@@ -55,102 +50,92 @@ def temp_project_root(tmp_path):
     return project_root
 
 
-def test_discover_vite_apps_all(temp_project_root):
-    """Test that all apps with fe directories are discovered."""
-    from django_umin.management.commands.vite_dev import Command
+@pytest.fixture(scope="session")
+def app_paths(temp_project_root):
+    """Map each app in the shared project to its path string."""
+    return {
+        app_name: os.fspath(temp_project_root / app_name)
+        for app_name in ["app1", "app2", "app3"]
+    }
 
-    cmd = Command()
 
-    # Mock app configs
-    mock_apps = []
-    for app_name in ["app1", "app2", "app3"]:
-        app_config = Mock(spec=AppConfig)
-        app_config.name = app_name
-        app_config.path = str(temp_project_root / app_name)
-        mock_apps.append(app_config)
+@pytest.fixture
+def writable_project_root(temp_project_root, tmp_path):
+    """Copy the shared project structure for a test that modifies it."""
+    return Path(shutil.copytree(temp_project_root, tmp_path / "project"))
 
-    with patch("django_umin.management.commands.vite_dev.apps") as mock_apps_module:
-        mock_apps_module.get_app_configs.return_value = mock_apps
 
-        result = cmd.discover_vite_apps(None)
+def test_discover_vite_apps_all(app_paths, fake_app, patched_command_apps, cmd):
+    """Test that all apps with fe directories are discovered."""
+    # Fake app configs
+    patched_command_apps(
+        [fake_app(app_name, path) for app_name, path in app_paths.items()]
+    )
+
+    result = cmd.discover_vite_apps(None)
 
     assert len(result) == 3
-    assert all(ac.name in ["app1", "app2", "app3"] for ac in result)
+    assert all(ac.name in ["app1", "app2", "app3"] for ac, _ in result)
+    assert all(fe_dir == os.path.join(ac.path, "fe") for ac, fe_dir in result)
 
 
-def test_discover_vite_apps_specific(temp_project_root):
+def test_discover_vite_apps_specific(app_paths, fake_app, patched_command_apps, cmd):
     """Test that only specified apps are discovered."""
-    from django_umin.management.commands.vite_dev import Command
-
-    cmd = Command()
-    cmd.stderr = StringIO()
-
-    # Mock app configs
-    app1_config = Mock(spec=AppConfig)
-    app1_config.name = "app1"
-    app1_config.path = str(temp_project_root / "app1")
-
-    app2_config = Mock(spec=AppConfig)
-    app2_config.name = "app2"
-    app2_config.path = str(temp_project_root / "app2")
+    # Fake app configs
+    patched_command_apps(
+        [fake_app(app_name, path) for app_name, path in app_paths.items()]
+    )
 
-    with patch("django_umin.management.commands.vite_dev.apps") as mock_apps_module:
-        mock_apps_module.get_app_config.side_effect = lambda name: {
-            "app1": app1_config,
-            "app2": app2_config,
-        }[name]
-
-        result = cmd.discover_vite_apps(["app1", "app2"])
+    result = cmd.discover_vite_apps(["app1", "app2"])
 
     assert len(result) == 2
-    assert all(ac.name in ["app1", "app2"] for ac in result)
+    assert all(ac.name in ["app1", "app2"] for ac, _ in result)
 
 
-def test_discover_vite_apps_warns_missing_fe(temp_project_root):
+def test_discover_vite_apps_warns_missing_fe(
+    writable_project_root, fake_app, patched_command_apps, cmd
+):
     """Test that warning is issued for apps without fe directory."""
-    from django_umin.management.commands.vite_dev import Command
-
-    cmd = Command()
-    cmd.stderr = StringIO()
-
     # Create an app without fe directory
-    app_without_fe = temp_project_root / "app_no_fe"
+    app_without_fe = writable_project_root / "app_no_fe"
     app_without_fe.mkdir()
 
-    app_config = Mock(spec=AppConfig)
-    app_config.name = "app_no_fe"
-    app_config.path = str(app_without_fe)
+    patched_command_apps([fake_app("app_no_fe", app_without_fe)])
 
-    with patch("django_umin.management.commands.vite_dev.apps") as mock_apps_module:
-        mock_apps_module.get_app_config.return_value = app_config
-
-        result = cmd.discover_vite_apps(["app_no_fe"])
+    result = cmd.discover_vite_apps(["app_no_fe"])
 
     assert len(result) == 0
     assert "does not have a 'fe' directory" in cmd.stderr.getvalue()
 
 
-def test_discover_vite_apps_errors_on_nonexistent_app():
+def test_discover_vite_apps_errors_on_nonexistent_app(patched_command_apps, cmd):
     """Test that error is issued for non-existent apps."""
-    from django_umin.management.commands.vite_dev import Command
-
-    cmd = Command()
-    cmd.stderr = StringIO()
+    patched_command_apps([])
 
-    with patch("django_umin.management.commands.vite_dev.apps") as mock_apps_module:
-        mock_apps_module.get_app_config.side_effect = LookupError("App not found")
-
-        result = cmd.discover_vite_apps(["nonexistent"])
+    result = cmd.discover_vite_apps(["nonexistent"])
 
     assert len(result) == 0
     assert "not found" in cmd.stderr.getvalue()
 
 
-def test_discover_assets(temp_project_root):
-    """Test that assets are correctly discovered."""
-    from django_umin.management.commands.vite_dev import Command
+def test_get_fe_dir_cache_invalidated_on_change(writable_project_root, fake_app):
+    """Test that a cached missing 'fe' directory is noticed once created."""
+    app_dir = writable_project_root / "app_later_fe"
+    app_dir.mkdir()
+    app_config = fake_app("app_later_fe", app_dir)
+
+    assert Command().get_fe_dir(app_config) is None
+
+    (app_dir / "fe").mkdir()
+    # Make sure the directory mtime moves even on coarse-grained filesystems
+    stat = os.stat(app_dir)
+    os.utime(app_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert Command().get_fe_dir(app_config) == str(app_dir / "fe")
 
-    cmd = Command()
+
+def test_discover_assets(temp_project_root, cmd):
+    """Test that assets are correctly discovered."""
     fe_dir = temp_project_root / "app1" / "fe"
 
     assets = cmd.discover_assets(str(fe_dir), "app1")
@@ -167,23 +152,75 @@ def test_discover_assets(temp_project_root):
     assert assets["app1-js-page-page-js"] == "js/page/page.js"
 
 
-def test_generate_vite_config_multiple_apps(temp_project_root):
-    """Test that vite config correctly includes multiple apps."""
-    from django_umin.management.commands.vite_dev import Command
+def test_discover_assets_skips_hidden_and_other_files(writable_project_root, cmd):
+    """Test that hidden entries and non-asset files are not discovered."""
+    fe_dir = writable_project_root / "app1" / "fe"
+    (fe_dir / "js" / ".hidden.js").write_text("// Hidden")
+    (fe_dir / "js" / ".cache").mkdir()
+    (fe_dir / "js" / ".cache" / "cached.js").write_text("// Cached")
+    (fe_dir / "js" / "notes.txt").write_text("Not an asset")
+    (fe_dir / "css" / "nested").mkdir()
+    (fe_dir / "css" / "nested" / "deep.css").write_text("/* Not top-level */")
+
+    assets = cmd.discover_assets(str(fe_dir), "app1")
+
+    assert sorted(assets) == [
+        "app1-app-css",
+        "app1-js-main-js",
+        "app1-js-page-page-js",
+    ]
+
+
+def test_discover_assets_cache_invalidated_on_change(writable_project_root, cmd):
+    """Test that cached assets are refreshed when the fe directory changes."""
+    fe_dir = writable_project_root / "app1" / "fe"
+
+    assets = cmd.discover_assets(str(fe_dir), "app1")
+    assert "app1-js-extra-js" not in assets
 
-    cmd = Command()
+    extra = fe_dir / "js" / "extra.js"
+    extra.write_text("// Extra JS content")
+    # Make sure the directory mtime moves even on coarse-grained filesystems
+    stat = os.stat(fe_dir / "js")
+    os.utime(fe_dir / "js", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assets = cmd.discover_assets(str(fe_dir), "app1")
+    assert assets["app1-js-extra-js"] == "js/extra.js"
+
+
+def test_discover_assets_sees_new_file_in_nested_dir(writable_project_root, cmd):
+    """Test that a file added below fe/js/page invalidates the cached assets."""
+    fe_dir = writable_project_root / "app1" / "fe"
+    page_dir = fe_dir / "js" / "page"
+
+    assets = cmd.discover_assets(str(fe_dir), "app1")
+    assert "app1-js-page-other-js" not in assets
+
+    (page_dir / "other.js").write_text("// Other page")
+    # Only the nested directory's mtime changes, not fe/, fe/css or fe/js
+    stat = os.stat(page_dir)
+    os.utime(page_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assets = cmd.discover_assets(str(fe_dir), "app1")
+    assert assets["app1-js-page-other-js"] == "js/page/other.js"
 
-    # Create mock app configs
-    app_configs = []
-    for app_name in ["app1", "app2"]:
-        app_config = Mock(spec=AppConfig)
-        app_config.name = app_name
-        app_config.path = str(temp_project_root / app_name)
-        app_configs.append(app_config)
 
-    config = cmd.generate_vite_config(str(temp_project_root), app_configs)
+@pytest.fixture(scope="module")
+def vite_config(temp_project_root, app_paths, fake_app):
+    """Generate the Vite config for the shared project's apps, once."""
+    app_configs = [
+        (fake_app(app_name, path), os.path.join(path, "fe"))
+        for app_name, path in app_paths.items()
+    ]
 
-    # Verify that both apps are included in the config
+    return Command().generate_vite_config(os.fspath(temp_project_root), app_configs)
+
+
+def test_generate_vite_config_multiple_apps(vite_config):
+    """Test that vite config correctly includes multiple apps."""
+    config = vite_config
+
+    # Verify that the apps are included in the config
     assert "app1" in config
     assert "app2" in config
 
@@ -210,40 +247,21 @@ def test_generate_vite_config_multiple_apps(temp_project_root):
     assert "Access-Control-Allow-Origin" in config
 
 
-def test_vite_config_includes_watch_configuration(temp_project_root):
+def test_vite_config_includes_watch_configuration(vite_config):
     """Test that vite config includes watch configuration for all apps."""
-    from django_umin.management.commands.vite_dev import Command
-
-    cmd = Command()
-
-    app_configs = []
-    for app_name in ["app1", "app2", "app3"]:
-        app_config = Mock(spec=AppConfig)
-        app_config.name = app_name
-        app_config.path = str(temp_project_root / app_name)
-        app_configs.append(app_config)
-
-    config = cmd.generate_vite_config(str(temp_project_root), app_configs)
-
-    # Verify watch configuration
-    assert "watch:" in config
-    assert "include:" in config
+    assert "watch:" in vite_config
+    assert "include:" in vite_config
 
 
 @override_settings(
     BASE_DIR="/fake/project",
     DJANGO_UMIN_VITE_DEV_SERVER_PORT=5173,
 )
-def test_handle_no_node_modules(capsys):
+def test_handle_no_node_modules(monkeypatch, cmd):
     """Test that command errors when node_modules is missing."""
-    from django_umin.management.commands.vite_dev import Command
-
-    cmd = Command()
-    cmd.stdout = StringIO()
-    cmd.stderr = StringIO()
+    monkeypatch.setattr(os.path, "isdir", lambda path: False)
 
-    with patch("os.path.isdir", return_value=False):
-        cmd.handle()
+    cmd.handle()
 
     assert "node_modules directory not found" in cmd.stderr.getvalue()
 
@@ -251,19 +269,12 @@ def test_handle_no_node_modules(capsys):
 @override_settings(
     BASE_DIR="/fake/project",
 )
-def test_handle_no_apps_with_fe(capsys):
+def test_handle_no_apps_with_fe(monkeypatch, patched_command_apps, cmd):
     """Test that command errors when no apps with fe directories exist."""
-    from django_umin.management.commands.vite_dev import Command
+    monkeypatch.setattr(os.path, "isdir", lambda path: True)
+    patched_command_apps([])
 
-    cmd = Command()
-    cmd.stdout = StringIO()
-    cmd.stderr = StringIO()
-
-    with patch("os.path.isdir", return_value=True):
-        with patch("django_umin.management.commands.vite_dev.apps") as mock_apps_module:
-            mock_apps_module.get_app_configs.return_value = []
-
-            cmd.handle(app_names=None)
+    cmd.handle(app_names=None)
 
     assert "No apps with 'fe' directories found" in cmd.stderr.getvalue()
 
@@ -272,48 +283,125 @@ def test_handle_no_apps_with_fe(capsys):
     BASE_DIR="/fake/project",
     DJANGO_UMIN_VITE_DEV_SERVER_PORT=5173,
 )
-def test_handle_runs_vite_dev_server(temp_project_root):
+def test_handle_runs_vite_dev_server(
+    writable_project_root, fake_app, patched_command_apps, monkeypatch, cmd
+):
     """Test that vite dev server is started with correct configuration."""
-    from django_umin.management.commands.vite_dev import Command
-
-    cmd = Command()
-    cmd.stdout = StringIO()
-    cmd.stderr = StringIO()
-
-    # Mock app configs
-    app_config = Mock(spec=AppConfig)
-    app_config.name = "app1"
-    app_config.path = str(temp_project_root / "app1")
-
-    with patch("os.path.isdir", return_value=True):
-        with patch("django_umin.management.commands.vite_dev.apps") as mock_apps_module:
-            mock_apps_module.get_app_configs.return_value = [app_config]
-
-            with patch("subprocess.run") as mock_run:
-                mock_run.side_effect = KeyboardInterrupt()
-
-                with patch("tempfile.NamedTemporaryFile") as mock_tempfile:
-                    mock_file = Mock()
-                    mock_file.name = "/tmp/vite_config_test.js"
-                    mock_file.__enter__ = Mock(return_value=mock_file)
-                    mock_file.__exit__ = Mock(return_value=False)
-                    mock_tempfile.return_value = mock_file
-
-                    with patch("os.path.exists", return_value=True):
-                        with patch("os.remove"):
-                            cmd.handle(app_names=None)
-
-                # Verify subprocess.run was called with correct arguments
-                mock_run.assert_called_once()
-                call_args = mock_run.call_args
-                assert call_args[0][0] == [
-                    "npx",
-                    "vite",
-                    "--config",
-                    "/tmp/vite_config_test.js",
-                    "--host",
-                    "0.0.0.0",
-                ]
+    # Fake app configs
+    patched_command_apps([fake_app("app1", writable_project_root / "app1")])
+
+    config_file = str(writable_project_root / "vite_config_test.js")
+    fd = os.open(config_file, os.O_WRONLY | os.O_CREAT)
+    monkeypatch.setattr(os.path, "isdir", lambda path: True)
+
+    cmd._runner = Mock(side_effect=KeyboardInterrupt())
+    cmd._mkstemp = lambda **kwargs: (fd, config_file)
+    cmd._remove = Mock()
+
+    cmd.handle(app_names=None)
+
+    # Verify Vite was run with correct arguments
+    cmd._runner.assert_called_once()
+    call_args = cmd._runner.call_args
+    assert call_args[0][0] == [
+        "npx",
+        "vite",
+        "--config",
+        config_file,
+        "--host",
+        "0.0.0.0",
+    ]
+    cmd._remove.assert_called_once_with(config_file)
 
     assert "Starting Vite dev server" in cmd.stdout.getvalue()
     assert "stopped successfully" in cmd.stdout.getvalue()
+
+
+def test_vite_command_uses_local_vite_bin(tmp_path):
+    """Test that the locally installed Vite is run with node directly."""
+    vite_bin = tmp_path / "node_modules" / "vite" / "bin" / "vite.js"
+    vite_bin.parent.mkdir(parents=True)
+    vite_bin.write_text("// vite")
+
+    assert vite_command(str(tmp_path), "--config", "vite.config.js") == [
+        "node",
+        str(vite_bin),
+        "--config",
+        "vite.config.js",
+    ]
+
+
+def test_vite_command_falls_back_to_npx(tmp_path):
+    """Test that npx is used when Vite is not installed locally."""
+    assert vite_command(str(tmp_path), "--config", "vite.config.js") == [
+        "npx",
+        "vite",
+        "--config",
+        "vite.config.js",
+    ]
+
+
+@override_settings(
+    BASE_DIR="/fake/project",
+)
+def test_dev_serve_writes_to_given_streams(monkeypatch):
+    """Test that dev_serve runs the command in-process with the given streams."""
+    stdout = StringIO()
+    stderr = StringIO()
+
+    monkeypatch.setattr(os.path, "isdir", lambda path: False)
+
+    dev_serve(stdout, stderr)
+
+    assert "node_modules directory not found" in stderr.getvalue()
+
+
+def test_handle_exec_replaces_process(
+    tmp_path, settings, fake_app, patched_command_apps, monkeypatch, cmd
+):
+    """Test that --exec replaces the process with Vite instead of a child."""
+    settings.BASE_DIR = str(tmp_path)
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "testapp" / "fe" / "css").mkdir(parents=True)
+
+    patched_command_apps([fake_app("testapp", tmp_path / "testapp")])
+
+    # A real exec never returns; stop the command where it would
+    mock_exec = Mock(side_effect=SystemExit)
+    monkeypatch.setattr(os, "execvpe", mock_exec)
+    cmd._runner = Mock()
+    # Restore the working directory the command changes to
+    monkeypatch.chdir(os.getcwd())
+
+    with pytest.raises(SystemExit):
+        cmd.handle(app_names=None, exec_vite=True)
+
+    assert os.getcwd() == str(tmp_path)
+
+    command = mock_exec.call_args[0][1]
+    assert mock_exec.call_args[0][0] == "npx"
+    assert command[:3] == ["npx", "vite", "--config"]
+    cmd._runner.assert_not_called()
+    assert f"Vite config will be kept at: {command[3]}" in cmd.stdout.getvalue()
+
+
+def test_handle_exec_falls_back_to_child_process(
+    tmp_path, settings, fake_app, patched_command_apps, monkeypatch, cmd
+):
+    """Test that a missing executable falls back to subprocess.run."""
+    settings.BASE_DIR = str(tmp_path)
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "testapp" / "fe" / "css").mkdir(parents=True)
+
+    patched_command_apps([fake_app("testapp", tmp_path / "testapp")])
+
+    cwd = os.getcwd()
+    monkeypatch.setattr(os, "execvpe", Mock(side_effect=FileNotFoundError))
+    cmd._runner = Mock(side_effect=KeyboardInterrupt)
+
+    cmd.handle(app_names=None, exec_vite=True)
+
+    cmd._runner.assert_called_once()
+    assert os.getcwd() == cwd
+    assert "starting Vite as a child process" in cmd.stderr.getvalue()
+    assert "Cleaned up temporary config file" in cmd.stdout.getvalue()
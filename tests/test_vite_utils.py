@@ -0,0 +1,77 @@
+"""Tests for the helpers shared by the Vite management commands."""
+
+import os
+
+import pytest
+
+from django_umin.management.commands.vite_build import Command as BuildCommand
+from django_umin.management.vite_utils import discover_fe_assets
+
+
+def touch_dir(path):
+    """Move a directory's mtime forward, even on coarse-grained filesystems."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def fe_dir(tmp_path):
+    """Create an 'fe' directory with a CSS file and nested JS files."""
+    fe_dir = tmp_path / "fe"
+    (fe_dir / "css").mkdir(parents=True)
+    (fe_dir / "css" / "app.css").write_text("/* CSS */")
+    (fe_dir / "js" / "page").mkdir(parents=True)
+    (fe_dir / "js" / "main.js").write_text("// JS")
+    (fe_dir / "js" / "page" / "a.js").write_text("// Page A")
+    return fe_dir
+
+
+def test_discover_fe_assets_finds_css_and_nested_js(fe_dir):
+    """Test that top-level CSS and nested JS files are found."""
+    css_files, js_files = discover_fe_assets(str(fe_dir))
+
+    assert css_files == ("app.css",)
+    assert sorted(js_files) == ["main.js", os.path.join("page", "a.js")]
+
+
+def test_discover_fe_assets_does_not_follow_symlinked_dirs(fe_dir):
+    """Test that a symlink loop below fe/js is not walked into."""
+    os.symlink(fe_dir / "js", fe_dir / "js" / "page" / "loop")
+
+    _, js_files = discover_fe_assets(str(fe_dir))
+
+    assert sorted(js_files) == ["main.js", os.path.join("page", "a.js")]
+
+
+def test_discover_fe_assets_sees_new_file_in_nested_dir(fe_dir):
+    """Test that a file added below fe/js/page invalidates the cache."""
+    discover_fe_assets(str(fe_dir))
+
+    (fe_dir / "js" / "page" / "b.js").write_text("// Page B")
+    touch_dir(fe_dir / "js" / "page")
+
+    _, js_files = discover_fe_assets(str(fe_dir))
+    assert os.path.join("page", "b.js") in js_files
+
+
+def test_discover_fe_assets_sees_new_nested_dir(fe_dir):
+    """Test that files in a newly created nested directory are found."""
+    discover_fe_assets(str(fe_dir))
+
+    (fe_dir / "js" / "page" / "sub").mkdir()
+    (fe_dir / "js" / "page" / "sub" / "c.js").write_text("// Sub")
+    touch_dir(fe_dir / "js" / "page")
+
+    _, js_files = discover_fe_assets(str(fe_dir))
+    assert os.path.join("page", "sub", "c.js") in js_files
+
+
+def test_vite_build_discover_assets_sees_nested_changes(fe_dir):
+    """Test that vite_build does not keep a stale asset set."""
+    cmd = BuildCommand()
+    assert "page-b-js" not in cmd.discover_assets(str(fe_dir))
+
+    (fe_dir / "js" / "page" / "b.js").write_text("// Page B")
+    touch_dir(fe_dir / "js" / "page")
+
+    assert cmd.discover_assets(str(fe_dir))["page-b-js"] == "js/page/b.js"
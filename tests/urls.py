@@ -0,0 +1,26 @@
+"""URLconf for tests that render the CRUD templates."""
+
+from django.contrib.auth.models import Group, Permission, User
+
+from django_umin.urls import CRUDRegistry
+from django_umin.views import CRUDView
+
+registry = CRUDRegistry()
+
+
+@registry.register
+class UserCRUD(CRUDView):
+    model = User
+
+
+@registry.register
+class GroupCRUD(CRUDView):
+    model = Group
+
+
+@registry.register
+class PermissionCRUD(CRUDView):
+    model = Permission
+
+
+urlpatterns = registry.get_urls()